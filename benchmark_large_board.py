@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark for PokeJong on large boards.
+Times offline setup, rule checks and full turns with hundreds of species.
+(There is no separate large-board mode: every setup names its species in one
+batch and keeps sparse tile counts.)
+"""
+
+import contextlib
+import io
+import random
+import sys
+import time
+
+from game import PokeJongGame
+
+
+def _timed(label: str, func, repeats: int = 1):
+    """Run func repeats times and print the average wall time."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"{label:<40} {elapsed * 1000:10.3f} ms")
+    return result
+
+
+def benchmark_large_board(num_pokemon: int = 500, num_checks: int = 10000):
+    """Run the large-board benchmark for num_pokemon species."""
+    print("=" * 60)
+    print(f"PokeJong large-board benchmark ({num_pokemon} species)")
+    print("=" * 60)
+
+    def setup():
+        game = PokeJongGame("Bench 1", "Bench 2")
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.setup_game(num_pokemon=num_pokemon, offline=True)
+        return game
+
+    game = _timed("setup_game (offline)", setup, repeats=5)
+    print(f"{'tiles in draw pile':<40} {len(game.draw_pile):10d}")
+
+    player = game.player1
+
+    def win_checks():
+        for _ in range(num_checks):
+            game.game_over = False
+            game.check_win_condition(player=player, claimed_tile=game.draw_pile[-1])
+
+    _timed(f"check_win_condition x{num_checks}", win_checks)
+
+    def play_turns():
+        rng = random.Random(0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            turns = 0
+            while not game.game_over and game.draw_tile():
+                game.discard_tile(rng.randrange(len(game.current_player.hand)))
+                if not game.check_opponent_action(game.discard_pile[-1]):
+                    game.switch_turn()
+                turns += 1
+        return turns
+
+    start = time.perf_counter()
+    turns = play_turns()
+    elapsed = time.perf_counter() - start
+    print(f"{'turns played':<40} {turns:10d}")
+    print(f"{'time per turn':<40} {elapsed / max(turns, 1) * 1000:10.3f} ms")
+
+
+if __name__ == "__main__":
+    benchmark_large_board(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,133 @@
+"""
+Game engine worker module for PokeJong.
+Runs PokeJongGame actions on a background thread so the Tk event loop never
+waits on a turn. The UI submits commands through a queue and polls for the
+state deltas each command produced.
+"""
+
+import queue
+import threading
+from typing import Dict, List, Optional
+
+from game import PokeJongGame
+from hand_analysis import hand_signature
+from player import Player
+
+
+def snapshot(game: PokeJongGame) -> Dict:
+    """Summarize the UI-visible game state as plain values."""
+    return {
+        'current_player': game.current_player.name,
+        'wall_size': len(game.draw_pile),
+        'last_discard': repr(game.discard_pile[-1]) if game.discard_pile else None,
+        'scores': (game.player1.score, game.player2.score),
+        'hands': (len(game.player1.hand), len(game.player2.hand)),
+        'melds': (len(game.player1.melds), len(game.player2.melds)),
+        'game_over': game.game_over,
+        'winner': game.winner.name if game.winner else None,
+    }
+
+
+def _seat_view(player: Player) -> Dict:
+    return {
+        'name': player.name,
+        'score': player.score,
+        'hand': list(player.hand),
+        'melds': [list(meld) for meld in player.melds],
+        'discards': list(player.discards),
+    }
+
+
+def view(game: PokeJongGame) -> Dict:
+    """Copy everything the UI draws, so it can render after the engine lock is released."""
+    return {
+        'players': (_seat_view(game.player1), _seat_view(game.player2)),
+        'current': 0 if game.current_player is game.player1 else 1,
+        'wall_size': len(game.draw_pile),
+        'last_discard': game.discard_pile[-1] if game.discard_pile else None,
+        'game_over': game.game_over,
+        'winner': game.winner.name if game.winner else None,
+        'hint_signature': hand_signature(game.current_player),
+    }
+
+
+class GameEngineWorker:
+    """Owns a PokeJongGame and applies UI commands to it on a worker thread.
+    
+    Commands are ('discard', tile_index) and ('meld', tile_indices). After each
+    command the worker posts an update dict with the command, whether it
+    succeeded, a 'delta' holding only the snapshot fields that changed, and a
+    'view' copied under the lock for rendering. Readers of the game from other
+    threads should hold `lock`, or use view().
+    """
+
+    def __init__(self, game: PokeJongGame):
+        self.game = game
+        self.lock = threading.Lock()
+        self._commands: queue.Queue = queue.Queue()
+        self._updates: queue.Queue = queue.Queue()
+        self._last = snapshot(game)
+        self._thread = threading.Thread(target=self._run, name="GameEngineWorker", daemon=True)
+        self._thread.start()
+
+    def view(self) -> Dict:
+        """Copy the game's drawable state under the lock."""
+        with self.lock:
+            return view(self.game)
+
+    def submit(self, command: str, argument):
+        """Queue a command for the engine thread."""
+        self._commands.put((command, argument))
+
+    def poll(self) -> List[Dict]:
+        """Return all updates posted since the last poll, without blocking."""
+        updates = []
+        while True:
+            try:
+                updates.append(self._updates.get_nowait())
+            except queue.Empty:
+                return updates
+
+    def stop(self):
+        """Ask the engine thread to exit after the commands already queued."""
+        self._commands.put(None)
+
+    def join(self, timeout: Optional[float] = None):
+        self._thread.join(timeout)
+
+    def _apply(self, command: str, argument) -> bool:
+        """Run one command against the game; returns whether it succeeded."""
+        game = self.game
+        if game.game_over:
+            return False
+        if command == 'discard':
+            return game.take_turn(argument)
+        if command == 'meld':
+            if not game.form_meld(argument):
+                return False
+            if game.check_win_condition():
+                print(f"{game.current_player.name} calls TSUMO and wins the game!")
+            return True
+        raise ValueError(f"Unknown engine command: {command}")
+
+    def _run(self):
+        while True:
+            item = self._commands.get()
+            if item is None:
+                return
+            command, argument = item
+            try:
+                with self.lock:
+                    ok = self._apply(command, argument)
+                    current = snapshot(self.game)
+                    drawn = view(self.game)
+                error = None
+            except Exception as e:  # Report to the UI instead of killing the thread
+                ok, error = False, str(e)
+                with self.lock:
+                    current = snapshot(self.game)
+                    drawn = view(self.game)
+
+            delta = {key: value for key, value in current.items() if self._last.get(key) != value}
+            self._last = current
+            self._updates.put({'command': command, 'ok': ok, 'error': error, 'delta': delta, 'view': drawn})
@@ -5,40 +5,36 @@ Handles game state, rules, and turn-based gameplay.
 
 from typing import Dict, List, Optional
 from pokemon_tile import PokemonTile, PokemonTileFactory
+from tile_source import TileDataSource, StubSource
 from player import Player
 from collections import Counter
+from tile_metadata import TileNameResolver
+from scoring_rules import HandSummary, ScoringRules, default_rules
+from zobrist import DISCARD_PILE, TURN, toggle, zobrist_key
 
 def get_tile_counts(tiles: List[PokemonTile]) -> Dict[int, int]:
         """Converts a list of PokemonTile objects into a frequency map using pokemon_id"""
         return Counter(tile.pokemon_id for tile in tiles)
     
-def _check_recursive(counts: Dict[int, int], has_pair: bool) -> bool:
-    """Recursive function to check for 4 Melds (Pung/Kong) + 1 Pair in tile counts."""
-    # Base Case 1: All the tiles have been consumed and a pair has been found = WIN!!
-    if all(count == 0 for count in counts.values()):
-        return has_pair
-    
-    # Find the next tile ID to process (smallest ID with count > 0)
-    current_tile_id = min((tile_id for tile_id, count in counts.items() if count > 0), default = None)
-    if current_tile_id is None:
+def is_winning_counts(counts: Dict[int, int]) -> bool:
+    """Return True if the tile counts form 4 Melds (Pung/Kong) + 1 Pair.
+
+    Only Pungs and a single Pair are legal sets, so every tile ID can be decided
+    on its own: its count must split into triplets, plus one pair for at most one
+    ID. This walks the sparse count map once instead of rescanning it with min()
+    for every set, which keeps rule checks flat on large boards.
+    """
+    has_pair = False
+    for count in counts.values():
+        if count <= 0 or count % 3 == 0:
+            continue
+        # Only a single ID may carry THE EYE (count == 2 mod 3)
+        if count % 3 == 2 and not has_pair:
+            has_pair = True
+            continue
         return False
-    
-    original_count = counts[current_tile_id]
-    # Try to form the PAIR / THE EYE
-    if not has_pair and original_count >= 2:
-        test_counts = counts.copy()
-        test_counts[current_tile_id] -= 2
-        if _check_recursive(test_counts, has_pair=True):
-            return True
-        
-    # Try to form a PUNG (Triplet: 3 identical tiles)
-    if original_count >= 3:
-        test_counts = counts.copy()
-        test_counts[current_tile_id] -= 3
-        if _check_recursive(test_counts, has_pair):
-            return True
-        
-    return False
+
+    return has_pair
 
 
 class PokeJongGame:
@@ -58,29 +54,111 @@ class PokeJongGame:
         self.other_player: Player = self.player2
         self.draw_pile: List[PokemonTile] = []
         self.discard_pile: List[PokemonTile] = []
+        # Tile counts and Zobrist hash of the discard pile, kept in step with it
+        self.discard_counts: Counter = Counter()
+        self.discard_hash: int = 0
         self.game_over = False
         self.winner: Optional[Player] = None
+        self.win_type: Optional[str] = None  # 'Tsumo' or 'Ron' once someone wins
+        self.turn_count = 0  # Discards made so far
+        # Score breakdown of the win ('base_points', 'bonus', 'bonuses', 'multiplier', 'final_score'),
+        # set by calculate_win_score
+        self.win_details: Optional[Dict] = None
+        # Background name fetch started by setup_game(lazy_names=True)
+        self.name_resolver: Optional[TileNameResolver] = None
+        # Optional object with record_turn(game, player, tile), called after every discard
+        self.recorder = None
+        # Point tables, win bonuses and win type multipliers (scoring_rules.json by default)
+        self.scoring: ScoringRules = default_rules()
         
-    def setup_game(self, num_pokemon: int = 20):
+    def setup_game(self, num_pokemon: int = 20, offline: bool = False, source: Optional[TileDataSource] = None, lazy_names: bool = False):
         """
         Set up the game by creating tiles and dealing initial hands.
         
         Args:
             num_pokemon: Number of different Pokemon to use (default 20)
+            offline: Skip PokeAPI entirely and use placeholder names
+            source: Where to fetch species data (default: PokeAPI)
+            lazy_names: Deal tiles built from IDs alone and fetch names in the
+                background (see self.name_resolver); tiles show placeholder names
+                until they arrive
         """
+        if offline:
+            source = StubSource()
+
         print("Setting up PokeJong game...")
-        print("Fetching Pokemon data from PokeAPI...")
         
-        # Create tile set (20 Pokemon x 4 copies = 80 tiles)
-        self.draw_pile = PokemonTileFactory.create_tile_set(num_pokemon, num_copies=4)
+        if offline:
+            print("Offline mode: using placeholder Pokemon names...")
+        elif source is None:
+            print("Fetching Pokemon names from PokeAPI in the background..." if lazy_names
+                  else "Fetching Pokemon data from PokeAPI...")
+
+        if lazy_names:
+            # Nothing to wait for: points come from the ID, names follow later
+            self.name_resolver = TileNameResolver(source)
+            species = PokemonTileFactory.create_species_lazy(num_pokemon, self.name_resolver.names, self.scoring)
+            self.draw_pile = PokemonTileFactory.build_wall(species)
+            self.name_resolver.start(range(1, num_pokemon + 1))
+        else:
+            # Create tile set (20 Pokemon x 4 copies = 80 tiles); PokeAPI names every species
+            # from its paginated list, so large boards need no separate mode
+            self.draw_pile = PokemonTileFactory.create_tile_set(num_pokemon, num_copies=4, source=source,
+                                                                rules=self.scoring)
+        
+        self.deal(self.draw_pile)
+        
+        print(f"Game setup complete! {len(self.draw_pile)} tiles remaining in draw pile.")
+
+    def deal(self, wall: List[PokemonTile]):
+        """
+        Use an already shuffled wall as the draw pile and deal initial hands.
+        
+        Args:
+            wall: Shuffled tiles; the end of the list is the top of the pile
+        """
+        # Walls built elsewhere (a match, a tournament) may be priced by other rules than
+        # self.scoring; reprice them so the running point totals follow this game's table
+        for index, tile in enumerate(wall):
+            points = self.scoring.points_for(tile.pokemon_id)
+            if tile.points != points:
+                wall[index] = tile.copy(points)
+        self.draw_pile = wall
         
         # Deal initial hands (13 tiles each, like in Mahjong)
         for _ in range(13):
             self.player1.draw_tile(self.draw_pile.pop())
             self.player2.draw_tile(self.draw_pile.pop())
-        
-        print(f"Game setup complete! {len(self.draw_pile)} tiles remaining in draw pile.")
     
+    def _push_discard(self, tile: PokemonTile):
+        """Put a tile on the discard pile, updating its counts and hash."""
+        self.discard_pile.append(tile)
+        self.discard_counts[tile.pokemon_id] += 1
+        self.discard_hash = toggle(self.discard_hash, DISCARD_PILE, 0, tile.pokemon_id,
+                                   self.discard_counts[tile.pokemon_id])
+
+    def _pop_discard(self) -> PokemonTile:
+        """Take the last tile off the discard pile (a Pung/Kong call), updating its counts and hash."""
+        tile = self.discard_pile.pop()
+        self.discard_hash = toggle(self.discard_hash, DISCARD_PILE, 0, tile.pokemon_id,
+                                   self.discard_counts[tile.pokemon_id])
+        self.discard_counts[tile.pokemon_id] -= 1
+        if self.discard_counts[tile.pokemon_id] <= 0:
+            del self.discard_counts[tile.pokemon_id]
+        return tile
+
+    def state_key(self) -> int:
+        """
+        64-bit Zobrist key of the position, for transposition tables and replay dedup.
+        
+        Covers both hands, both players' melds, the discard pile (as a multiset) and
+        whose turn it is. Costs a few XORs; the parts are maintained incrementally.
+        """
+        key = self.player1.state_key() ^ self.player2.state_key() ^ self.discard_hash
+        if self.current_player is self.player2:
+            key ^= zobrist_key(TURN, 0, 0, 1)
+        return key
+
     def switch_turn(self):
         """Switch the current player."""
         self.current_player, self.other_player = self.other_player, self.current_player
@@ -113,7 +191,7 @@ class PokeJongGame:
         """
         tile = self.current_player.discard_tile(tile_index)
         if tile:
-            self.discard_pile.append(tile)
+            self._push_discard(tile)
             print(f"{self.current_player.name} discarded: {tile}")
             return True
         return False
@@ -139,24 +217,25 @@ class PokeJongGame:
         """
         player = player or self.current_player
 
-        tiles_to_check = player.hand.copy()
-        for meld in player.melds:
-            tiles_to_check.extend(meld)
-
+        num_tiles = len(player.hand) + sum(player.meld_counts.values())
         if claimed_tile:
-            tiles_to_check.append(claimed_tile)
+            num_tiles += 1
 
-        if len(tiles_to_check) != 14:
+        if num_tiles != 14:
             return False
         
-        tile_counts = get_tile_counts(tiles_to_check)
+        # Start from the player's sparse hand and meld counts rather than rebuilding from tiles
+        tile_counts = player.hand_counts + player.meld_counts
+        if claimed_tile:
+            tile_counts[claimed_tile.pokemon_id] += 1
 
-        if _check_recursive(tile_counts, has_pair=False):
+        if is_winning_counts(tile_counts):
             self.game_over = True
             self.winner = player
 
             winning_tile = claimed_tile if claimed_tile else player.hand[-1]
             win_type = 'Ron' if claimed_tile else 'Tsumo'
+            self.win_type = win_type
             self.calculate_win_score(player, winning_tile, win_type)
             return True
         
@@ -178,9 +257,8 @@ class PokeJongGame:
             return True # GAME OVER
         
         # Check for Pung (3 identical tiles)
-        hand_counts = get_tile_counts(opponent.hand)
         discard_id = discarded_tile.pokemon_id
-        current_count = hand_counts.get(discard_id, 0)
+        current_count = opponent.hand_counts.get(discard_id, 0)
 
         if current_count >= 2:
             # Player can call PUNG (2 matching in hand) or KONG (3 matching in hand)
@@ -197,7 +275,7 @@ class PokeJongGame:
                 opponent.claim_meld(discarded_tile, supporting_tiles, call_type)
                 
                 # The tile is removed from the discard pile (now in meld)
-                self.discard_pile.pop() 
+                self._pop_discard()
                 
                 # Switch turn to the meld caller (opponent) to discard
                 self.switch_turn() 
@@ -207,6 +285,37 @@ class PokeJongGame:
 
         return False # No action taken, continue normal turn flow
 
+    def take_turn(self, tile_index: int) -> bool:
+        """
+        Play out the current player's discard and everything it triggers.
+        
+        The opponent may call Ron or Pung/Kong on the discard; otherwise the turn
+        passes, the next player draws, and a Tsumo or an empty wall may end the game.
+        
+        Args:
+            tile_index: Index of the tile to discard from the current player's hand
+            
+        Returns:
+            True if the discard was made
+        """
+        player = self.current_player
+        if not self.discard_tile(tile_index):
+            return False
+        self.turn_count += 1
+        if self.recorder is not None:
+            self.recorder.record_turn(self, player, self.discard_pile[-1])
+
+        # Ron ends the game; a Pung/Kong call hands the turn to the caller, who discards next
+        if self.check_opponent_action(self.discard_pile[-1]):
+            return True
+
+        self.switch_turn()
+        if not self.draw_tile():
+            self.check_draw_condition()
+        elif self.check_win_condition():
+            print(f"{self.current_player.name} calls TSUMO and wins the game!")
+        return True
+
     def run_game_loop(self):
         """The main loop, running until the game ends."""
         while not self.game_over:
@@ -241,6 +350,24 @@ class PokeJongGame:
         
         return False
     
+    @property
+    def tsumo_multiplier(self) -> float:
+        """Score multiplier for a win on a draw (from self.scoring)."""
+        return self.scoring.multipliers['Tsumo']
+
+    @tsumo_multiplier.setter
+    def tsumo_multiplier(self, value: float):
+        self.scoring = self.scoring.with_multiplier('Tsumo', value)
+
+    @property
+    def ron_multiplier(self) -> float:
+        """Score multiplier for a win on a discard (from self.scoring)."""
+        return self.scoring.multipliers['Ron']
+
+    @ron_multiplier.setter
+    def ron_multiplier(self, value: float):
+        self.scoring = self.scoring.with_multiplier('Ron', value)
+
     def calculate_win_score(self, winner: Player, winning_tile: PokemonTile, win_type: str):
         """Calculate the final score for the winning player.
         
@@ -249,34 +376,32 @@ class PokeJongGame:
             winning_title: The 14th tile that completed the win.
             win_type: 'Tsumo' or 'Ron'"""
         
-        # 1. Base Score (Points from all tiles, including the winning tile)
-        base_points = sum(t.points for t in winner.hand) # Hand is the remaining 13 tiles after melds
-        base_points += sum(sum(t.points for t in meld) for meld in winner.melds)
-        base_points += winning_tile.points
-
-        # 2. Add Win Bonus (Simplified Fan/Yaku)
-        win_bonus = 0
-
-        # Check for a "Pung-Heavy Hand" (Toitoi or All Pungs) - if 4 melds are already Pungs/Kongs
-        if len(winner.melds) == 4 and all(len(meld) == 3 or len(meld) == 4 for meld in winner.melds):
-            win_bonus += 50 
-            print(f"[{winner.name}] Awarded 50 bonus points for All Pungs hand.")
-
-        # 3. Apply Win Type Multiplier
-        if win_type == 'Tsumo':
-            # Tsumo is generally more valuable as the winner takes all the points from the opponent.
-            final_score = (base_points + win_bonus) * 2
-            print(f"[{winner.name}] Tsumo Win Multiplier applied (x2).")
-        else: # Ron
-            # Ron is simpler; the winner takes the points from the discarder (or everyone in complex systems).
-            final_score = (base_points + win_bonus) * 1.5 
-            print(f"[{winner.name}] Ron Win Multiplier applied (x1.5).")
-
-        # 4. Update Score
-        winner.score += int(final_score)
+        # 1. Summarize the hand from the player's running totals (points of all tiles,
+        # including the winning tile, plus what the bonus rules check)
+        counts = winner.hand_counts + winner.meld_counts
+        if win_type == 'Ron':
+            counts[winning_tile.pokemon_id] += 1
+        summary = HandSummary(
+            hand_points=winner.hand_points,
+            meld_points=winner.meld_points,
+            winning_points=winning_tile.points,
+            counts=counts,
+            meld_sizes=tuple(len(meld) for meld in winner.melds),
+            win_type=win_type,
+        )
+
+        # 2. Apply the configured bonuses (e.g. All Pungs) and the win type multiplier
+        details = self.scoring.score(summary)
+        for name, points in details['bonuses']:
+            print(f"[{winner.name}] Awarded {points} bonus points for {name} hand.")
+        print(f"[{winner.name}] {win_type} Win Multiplier applied (x{details['multiplier']}).")
+
+        # 3. Update Score
+        self.win_details = details
+        winner.score += details['final_score']
         print(f"\n--- WINNER SCORE ---")
         print(f"Winner: {winner.name} | Win Type: {win_type}")
-        print(f"Base Points: {base_points} | Final Score Gained: {int(final_score)}")
+        print(f"Base Points: {details['base_points']} | Final Score Gained: {details['final_score']}")
         print(f"New Total Score: {winner.score}")
         print("--------------------")
 
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Game recorder module for PokeJong.
+Streams one row per finished game (and optionally one row per turn) to a
+columnar file, buffering at most chunk_size rows in memory at a time.
+
+Parquet and Arrow IPC output need pyarrow; without it the recorder falls back
+to CSV written in chunks.
+"""
+
+import contextlib
+import csv
+import os
+import sys
+from typing import Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional
+    pa = None
+    pq = None
+
+from game import PokeJongGame
+from player import Player
+from pokemon_tile import PokemonTile
+
+GAME_COLUMNS = ['game_id', 'seed', 'winner', 'win_type', 'base_points', 'bonus', 'final_score', 'turns',
+                'player1_score', 'player2_score']
+TURN_COLUMNS = ['game_id', 'turn', 'player_id', 'pokemon_id', 'wall_size']
+# Column types used for Parquet/Arrow output
+COLUMN_TYPES = {
+    'game_id': 'int64', 'seed': 'int64', 'winner': 'int64', 'win_type': 'string',
+    'base_points': 'int64', 'bonus': 'int64', 'final_score': 'int64', 'turns': 'int64',
+    'player1_score': 'int64', 'player2_score': 'int64',
+    'turn': 'int64', 'player_id': 'int64', 'pokemon_id': 'int64', 'wall_size': 'int64',
+}
+
+
+def _resolve_format(path: str, fmt: str) -> str:
+    """Pick 'parquet', 'arrow' or 'csv' from fmt ('auto' uses the file extension and pyarrow availability)."""
+    if fmt == 'auto':
+        extension = os.path.splitext(path)[1].lower()
+        fmt = {'.parquet': 'parquet', '.arrow': 'arrow', '.csv': 'csv'}.get(extension, 'parquet')
+    if fmt in ('parquet', 'arrow') and pa is None:
+        print(f"pyarrow is not installed; writing CSV instead of {fmt}.")
+        return 'csv'
+    return fmt
+
+
+class ColumnarStream:
+    """Append-only table file written in chunks of at most chunk_size rows."""
+
+    def __init__(self, path: str, columns: List[str], fmt: str = 'auto', chunk_size: int = 10000):
+        """
+        Args:
+            path: Output file; with CSV fallback a '.csv' extension replaces any other
+            columns: Column names, in order
+            fmt: 'auto', 'parquet', 'arrow' or 'csv'
+            chunk_size: Rows buffered before a chunk is written
+        """
+        self.columns = columns
+        self.format = _resolve_format(path, fmt)
+        if self.format == 'csv' and not path.endswith('.csv'):
+            path = os.path.splitext(path)[0] + '.csv'
+        self.path = path
+        self.chunk_size = chunk_size
+        self.rows_written = 0
+        self._buffer: Dict[str, List] = {column: [] for column in columns}
+        self._buffered = 0
+        self._writer = None
+        self._file = None
+
+        if self.format == 'csv':
+            self._file = open(path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(columns)
+        else:
+            self._schema = pa.schema([(column, getattr(pa, COLUMN_TYPES[column])()) for column in columns])
+            if self.format == 'parquet':
+                self._writer = pq.ParquetWriter(path, self._schema)
+            else:
+                self._file = pa.OSFile(path, 'wb')
+                self._writer = pa.ipc.new_stream(self._file, self._schema)
+
+    def write(self, row: Dict):
+        """Buffer one row, writing a chunk when the buffer is full."""
+        for column in self.columns:
+            self._buffer[column].append(row.get(column))
+        self._buffered += 1
+        if self._buffered >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Write any buffered rows as one chunk (a Parquet row group / Arrow record batch)."""
+        if not self._buffered:
+            return
+        if self.format == 'csv':
+            self._writer.writerows(zip(*(self._buffer[column] for column in self.columns)))
+        else:
+            batch = pa.record_batch([self._buffer[column] for column in self.columns], schema=self._schema)
+            self._writer.write_batch(batch)
+        self.rows_written += self._buffered
+        self._buffer = {column: [] for column in self.columns}
+        self._buffered = 0
+
+    def close(self):
+        """Flush and close the file."""
+        self.flush()
+        if self.format != 'csv':
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+class GameRecorder:
+    """Records finished games, and optionally every turn, to columnar files.
+    
+    Attach it to a game with `game.recorder = recorder` to receive turns, then
+    call record_game() once the game is over.
+    """
+
+    def __init__(self, games_path: str, turns_path: Optional[str] = None, fmt: str = 'auto',
+                 chunk_size: int = 10000):
+        """
+        Args:
+            games_path: Output file for one row per game
+            turns_path: Optional output file for one row per discard
+            fmt: 'auto', 'parquet', 'arrow' or 'csv'
+            chunk_size: Rows buffered per stream before writing
+        """
+        self.games = ColumnarStream(games_path, GAME_COLUMNS, fmt, chunk_size)
+        self.turns = ColumnarStream(turns_path, TURN_COLUMNS, fmt, chunk_size) if turns_path else None
+        self.next_game_id = 0
+
+    def __enter__(self) -> 'GameRecorder':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record_turn(self, game: PokeJongGame, player: Player, tile: PokemonTile):
+        """Record one discard of the game in progress (called by PokeJongGame.take_turn)."""
+        if self.turns is not None:
+            self.turns.write({
+                'game_id': self.next_game_id,
+                'turn': game.turn_count,
+                'player_id': player.player_id,
+                'pokemon_id': tile.pokemon_id,
+                'wall_size': len(game.draw_pile),
+            })
+
+    def record_game(self, game: PokeJongGame, seed: Optional[int] = None):
+        """Record a finished game and start numbering the next one."""
+        details = game.win_details or {}
+        self.games.write({
+            'game_id': self.next_game_id,
+            'seed': seed,
+            'winner': game.winner.player_id if game.winner else None,
+            'win_type': game.win_type,
+            'base_points': details.get('base_points'),
+            'bonus': details.get('bonus'),
+            'final_score': details.get('final_score'),
+            'turns': game.turn_count,
+            'player1_score': game.player1.score,
+            'player2_score': game.player2.score,
+        })
+        self.next_game_id += 1
+
+    def close(self):
+        """Flush and close every stream."""
+        self.games.close()
+        if self.turns is not None:
+            self.turns.close()
+
+
+if __name__ == "__main__":
+    # Usage: python game_recorder.py GAMES_FILE [TURNS_FILE] [NUM_GAMES]
+    from tournament import play_game, discard_loneliest
+    from pokemon_tile import PokemonTileFactory
+    from tile_source import StubSource
+
+    games_path = sys.argv[1] if len(sys.argv) > 1 else 'games.parquet'
+    turns_path = sys.argv[2] if len(sys.argv) > 2 else None
+    num_games = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+
+    species = [PokemonTileFactory.create_tile(i, StubSource()) for i in range(1, 21)]
+    with GameRecorder(games_path, turns_path) as recorder:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for seed in range(num_games):
+                play_game([discard_loneliest, discard_loneliest], species, seed, recorder=recorder)
+    print(f"Recorded {recorder.games.rows_written} games to {recorder.games.path}")
@@ -0,0 +1,253 @@
+"""
+Persistent game state module for PokeJong.
+Immutable snapshots of a game that share structure between versions, so bots
+can fork positions and the GUI can undo moves without deep-copying the game.
+
+Every operation returns a new state and leaves the old one untouched:
+- the wall is one shared tuple plus a top-of-pile index (drawing copies nothing),
+- discards, melds and the discard pile are cons lists (pushing/popping the
+  newest entry is O(1) and shares the rest),
+- a hand is a sorted tuple of at most 14 tiles, the only part that is copied.
+"""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from collections import Counter
+from pokemon_tile import PokemonTile
+from player import Player
+from scoring_rules import ScoringRules
+from zobrist import HAND, hash_counts
+from game import PokeJongGame
+
+
+class Cons(NamedTuple):
+    """One cell of a persistent singly linked list; head is the newest item."""
+    head: object
+    tail: Optional['Cons']
+    length: int
+
+
+def push(items: Optional[Cons], item) -> Cons:
+    """Return a new list with item added as the newest element."""
+    return Cons(item, items, (items.length if items else 0) + 1)
+
+
+def iter_newest_first(items: Optional[Cons]) -> Iterator:
+    """Iterate from the newest element to the oldest."""
+    while items is not None:
+        yield items.head
+        items = items.tail
+
+
+def to_list(items: Optional[Cons]) -> List:
+    """Materialize a cons list oldest-first, matching the order of the mutable game lists."""
+    result = list(iter_newest_first(items))
+    result.reverse()
+    return result
+
+
+def from_list(values: List) -> Optional[Cons]:
+    """Build a cons list from an oldest-first Python list."""
+    items = None
+    for value in values:
+        items = push(items, value)
+    return items
+
+
+def _insert_sorted(hand: Tuple[PokemonTile, ...], tile: PokemonTile) -> Tuple[PokemonTile, ...]:
+    """Insert tile into a hand kept sorted by pokemon_id, after any equal tiles (like Player.sort_hand)."""
+    i = len(hand)
+    while i > 0 and hand[i - 1].pokemon_id > tile.pokemon_id:
+        i -= 1
+    return hand[:i] + (tile,) + hand[i:]
+
+
+class PlayerState(NamedTuple):
+    """Immutable view of a Player."""
+    name: str
+    player_id: int
+    hand: Tuple[PokemonTile, ...]
+    discards: Optional[Cons]
+    melds: Optional[Cons]  # Cons list of tile tuples
+    score: int
+
+    @classmethod
+    def from_player(cls, player: Player) -> 'PlayerState':
+        return cls(player.name, player.player_id,
+                   tuple(sorted(player.hand, key=lambda tile: tile.pokemon_id)),
+                   from_list(player.discards), from_list([tuple(meld) for meld in player.melds]),
+                   player.score)
+
+    def to_player(self) -> Player:
+        player = Player(self.name, self.player_id)
+        player.hand = list(self.hand)
+        player.hand_counts = Counter(tile.pokemon_id for tile in self.hand)
+        player.hand_points = sum(tile.points for tile in self.hand)
+        player.hand_hash = hash_counts(HAND, self.player_id, player.hand_counts)
+        player.discards = to_list(self.discards)
+        for meld in to_list(self.melds):
+            player._add_meld(list(meld))
+        player.score = self.score
+        return player
+
+
+class GameState(NamedTuple):
+    """Immutable snapshot of a PokeJongGame.
+    
+    The draw/discard/meld methods mirror PokeJongGame and Player but return a new
+    state (or None where the mutable version would fail) instead of mutating.
+    Runtime attachments (name_resolver, recorder) are not part of the state and
+    are left unset by to_game().
+    """
+    players: Tuple[PlayerState, PlayerState]
+    current: int  # Index into players of the player whose turn it is
+    wall: Tuple[PokemonTile, ...]
+    wall_top: int  # wall[:wall_top] is the draw pile; its end is the top
+    discard_pile: Optional[Cons]
+    game_over: bool = False
+    winner: Optional[int] = None
+    turn_count: int = 0
+    win_type: Optional[str] = None
+    win_details: Optional[Dict] = None  # Treated as read-only; copied in and out of games
+    scoring: Optional[ScoringRules] = None  # None means default_rules()
+
+    @classmethod
+    def from_game(cls, game: PokeJongGame) -> 'GameState':
+        """Snapshot a mutable game."""
+        return cls(
+            players=(PlayerState.from_player(game.player1), PlayerState.from_player(game.player2)),
+            current=0 if game.current_player is game.player1 else 1,
+            wall=tuple(game.draw_pile),
+            wall_top=len(game.draw_pile),
+            discard_pile=from_list(game.discard_pile),
+            game_over=game.game_over,
+            winner=None if game.winner is None else (0 if game.winner is game.player1 else 1),
+            turn_count=game.turn_count,
+            win_type=game.win_type,
+            win_details=dict(game.win_details) if game.win_details is not None else None,
+            scoring=game.scoring,
+        )
+
+    def to_game(self) -> PokeJongGame:
+        """Materialize a mutable PokeJongGame for this state (e.g. after an undo)."""
+        game = PokeJongGame(self.players[0].name, self.players[1].name)
+        game.player1, game.player2 = (state.to_player() for state in self.players)
+        players = (game.player1, game.player2)
+        game.current_player, game.other_player = players[self.current], players[1 - self.current]
+        game.draw_pile = list(self.wall[:self.wall_top])
+        for tile in to_list(self.discard_pile):
+            game._push_discard(tile)
+        game.game_over = self.game_over
+        game.winner = None if self.winner is None else players[self.winner]
+        game.turn_count = self.turn_count
+        game.win_type = self.win_type
+        game.win_details = dict(self.win_details) if self.win_details is not None else None
+        if self.scoring is not None:
+            game.scoring = self.scoring
+        return game
+
+    @property
+    def current_player(self) -> PlayerState:
+        return self.players[self.current]
+
+    @property
+    def other_player(self) -> PlayerState:
+        return self.players[1 - self.current]
+
+    def _with_player(self, index: int, player: PlayerState, **changes) -> 'GameState':
+        players = (player, self.players[1]) if index == 0 else (self.players[0], player)
+        return self._replace(players=players, **changes)
+
+    def switch_turn(self) -> 'GameState':
+        """Switch the current player."""
+        return self._replace(current=1 - self.current)
+
+    def draw_tile(self) -> Optional['GameState']:
+        """Current player draws the top tile; None if the draw pile is empty."""
+        if self.wall_top == 0:
+            return None
+        tile = self.wall[self.wall_top - 1]
+        player = self.current_player
+        return self._with_player(self.current, player._replace(hand=_insert_sorted(player.hand, tile)),
+                                 wall_top=self.wall_top - 1)
+
+    def discard_tile(self, tile_index: int) -> Optional['GameState']:
+        """Current player discards hand[tile_index]; None if the index is invalid."""
+        player = self.current_player
+        if not 0 <= tile_index < len(player.hand):
+            return None
+        tile = player.hand[tile_index]
+        player = player._replace(hand=player.hand[:tile_index] + player.hand[tile_index + 1:],
+                                 discards=push(player.discards, tile))
+        return self._with_player(self.current, player, discard_pile=push(self.discard_pile, tile))
+
+    def form_meld(self, tile_indices: List[int]) -> Optional['GameState']:
+        """Current player melds 3 identical tiles from hand; None if they don't form a Pung."""
+        player = self.current_player
+        if len(tile_indices) != 3 or len(set(tile_indices)) != 3:
+            return None
+        if not all(0 <= i < len(player.hand) for i in tile_indices):
+            return None
+        meld = tuple(player.hand[i] for i in sorted(tile_indices, reverse=True))
+        if any(tile.pokemon_id != meld[0].pokemon_id for tile in meld):
+            return None
+
+        hand = tuple(tile for i, tile in enumerate(player.hand) if i not in tile_indices)
+        player = player._replace(hand=hand, melds=push(player.melds, meld),
+                                 score=player.score + sum(t.points for t in meld))
+        return self._with_player(self.current, player)
+
+    def claim_meld(self, meld_type: str) -> Optional['GameState']:
+        """
+        The other player claims the last discard as a PUNG or KONG and takes the turn.
+        
+        Args:
+            meld_type: 'PUNG' (2 supporting tiles) or 'KONG' (3 supporting tiles)
+            
+        Returns:
+            The new state, or None if there is no discard or too few matching tiles
+        """
+        if self.discard_pile is None:
+            return None
+        claimed_tile = self.discard_pile.head
+        needed = 3 if meld_type == 'KONG' else 2
+        claimant_index = 1 - self.current
+        claimant = self.players[claimant_index]
+
+        matching = [i for i, tile in enumerate(claimant.hand) if tile == claimed_tile][:needed]
+        if len(matching) < needed:
+            return None
+        meld = (claimed_tile,) + tuple(claimant.hand[i] for i in matching)
+        hand = tuple(tile for i, tile in enumerate(claimant.hand) if i not in matching)
+
+        meld_points = sum(t.points for t in meld)
+        if meld_type == 'KONG':
+            meld_points *= 2  # bonus points
+
+        claimant = claimant._replace(hand=hand, melds=push(claimant.melds, meld), score=claimant.score + meld_points)
+        return self._with_player(claimant_index, claimant, discard_pile=self.discard_pile.tail,
+                                 current=claimant_index)
+
+
+class GameHistory:
+    """Undo stack of GameStates; consecutive states share nearly all their structure."""
+
+    def __init__(self, initial: GameState):
+        self._states: List[GameState] = [initial]
+
+    @property
+    def current(self) -> GameState:
+        return self._states[-1]
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def push(self, state: GameState) -> GameState:
+        """Record a new state as the current one."""
+        self._states.append(state)
+        return state
+
+    def undo(self) -> GameState:
+        """Drop the current state (never the initial one) and return the previous state."""
+        if len(self._states) > 1:
+            self._states.pop()
+        return self._states[-1]
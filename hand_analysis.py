@@ -0,0 +1,198 @@
+"""
+Hand analysis module for PokeJong.
+Computes winning tiles (waits), distance to a win and a suggested discard for a
+hand, plus a background worker so the GUI can ask for hints without blocking.
+"""
+
+import queue
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from game import is_winning_counts
+from player import Player
+
+# (sorted hand counts, sorted meld counts): identical positions share one signature
+HandSignature = Tuple[Tuple[Tuple[int, int], ...], Tuple[Tuple[int, int], ...]]
+# Analyses kept by a HintWorker; the least recently used are dropped first
+HINT_CACHE_SIZE = 1024
+
+
+class HandAnalysis:
+    """Result of analyze_hand."""
+
+    def __init__(self, waits: List[int], distance: Optional[int], best_discard: Optional[int]):
+        """
+        Args:
+            waits: pokemon_ids that would complete the hand (after best_discard for 14 tiles)
+            distance: Tiles still needed to win (0 = already winning, None = cannot win)
+            best_discard: pokemon_id to discard from a 14-tile hand, if any
+        """
+        self.waits = waits
+        self.distance = distance
+        self.best_discard = best_discard
+
+    def __repr__(self):
+        return f"HandAnalysis(waits={self.waits}, distance={self.distance}, best_discard={self.best_discard})"
+
+
+def hand_signature(player: Player) -> HandSignature:
+    """Return a hashable key for the player's hand and melds."""
+    meld_counts = Counter(tile.pokemon_id for meld in player.melds for tile in meld)
+    return tuple(sorted(player.hand_counts.items())), tuple(sorted(meld_counts.items()))
+
+
+def _tiles_needed(counts: Counter, meld_counts: Dict[int, int]) -> Optional[int]:
+    """
+    Fewest tiles to draw before counts (hand + melds) can form 4 Pungs + 1 Pair.
+    
+    The best target keeps every meld as a Pung, adds the hand's strongest
+    species as the other Pungs and one more species as the Pair; the distance is
+    14 minus the tiles the hand already shares with that target. A spare copy
+    of a melded species is left out of the target: it only has to be discarded.
+    """
+    if any(count > 3 for count in meld_counts.values()):
+        return None  # A Kong can never fit the 14-tile winning shape
+    meld_ids = list(meld_counts)
+
+    free = sorted((counts[pokemon_id] for pokemon_id in counts if pokemon_id not in meld_ids and counts[pokemon_id] > 0),
+                  reverse=True)
+    pungs_needed = 4 - len(meld_ids)
+    if pungs_needed < 0:
+        return None
+    best = 0
+    # Try each free species (or a species not in hand) as the Pair
+    for pair_index in range(len(free) + 1):
+        pair = min(free[pair_index], 2) if pair_index < len(free) else 0
+        others = free[:pair_index] + free[pair_index + 1:]
+        best = max(best, pair + sum(min(count, 3) for count in others[:pungs_needed]))
+    return 14 - 3 * len(meld_ids) - best
+
+
+def _waits(counts: Counter) -> List[int]:
+    """pokemon_ids that complete a 13-tile position (only IDs already held can)."""
+    waits = []
+    for pokemon_id in sorted(counts):
+        counts[pokemon_id] += 1
+        if is_winning_counts(counts):
+            waits.append(pokemon_id)
+        counts[pokemon_id] -= 1
+    return waits
+
+
+def analyze_hand(hand_counts: Dict[int, int], meld_counts: Dict[int, int]) -> HandAnalysis:
+    """
+    Analyze a hand without touching any game state.
+    
+    Args:
+        hand_counts: pokemon_id -> tiles in hand
+        meld_counts: pokemon_id -> tiles in the player's melds
+        
+    Returns:
+        HandAnalysis for a 13-tile (waiting) or 14-tile (about to discard) position
+    """
+    counts = Counter(hand_counts)
+    counts.update(meld_counts)
+    counts = +counts
+    num_tiles = sum(counts.values())
+
+    if num_tiles == 13:
+        return HandAnalysis(_waits(counts), _tiles_needed(counts, meld_counts), None)
+    if num_tiles != 14:
+        return HandAnalysis([], None, None)
+    if is_winning_counts(counts):
+        return HandAnalysis([], 0, None)
+
+    best = None
+    for pokemon_id in sorted(pid for pid, count in hand_counts.items() if count > 0):
+        counts[pokemon_id] -= 1
+        needed = _tiles_needed(counts, meld_counts)
+        if needed is not None:
+            waits = _waits(counts)
+            key = (needed, -len(waits))
+            if best is None or key < best[0]:
+                best = (key, pokemon_id, waits)
+        counts[pokemon_id] += 1
+
+    if best is None:
+        return HandAnalysis([], None, None)
+    (needed, _), pokemon_id, waits = best
+    return HandAnalysis(waits, needed, pokemon_id)
+
+
+class HintWorker:
+    """Runs analyze_hand on a background thread with a bounded per-signature LRU cache.
+    
+    Only the newest request matters: older queued requests are skipped, and a
+    result finished after a newer request arrived is dropped as stale.
+    """
+
+    def __init__(self, max_entries: int = HINT_CACHE_SIZE):
+        """
+        Start the worker thread.
+
+        Args:
+            max_entries: Analyses to keep cached before evicting the least recently used
+        """
+        self.max_entries = max_entries
+        self._requests: queue.Queue = queue.Queue()
+        self._results: queue.Queue = queue.Queue()
+        self._cache: 'OrderedDict[HandSignature, HandAnalysis]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._latest = 0
+        self._thread = threading.Thread(target=self._run, name="HintWorker", daemon=True)
+        self._thread.start()
+
+    def request(self, signature: HandSignature) -> Optional[HandAnalysis]:
+        """
+        Ask for an analysis of the position described by signature.
+        
+        Returns:
+            The cached analysis immediately if this position was seen before,
+            otherwise None (the result arrives later through poll())
+        """
+        with self._lock:
+            self._latest += 1
+            cached = self._cache.get(signature)
+            if cached is not None:
+                self._cache.move_to_end(signature)
+                return cached
+            self._requests.put((self._latest, signature))
+        return None
+
+    def poll(self) -> List[Tuple[HandSignature, HandAnalysis]]:
+        """Return finished, still current results without blocking."""
+        results = []
+        while True:
+            try:
+                request_id, signature, analysis = self._results.get_nowait()
+            except queue.Empty:
+                return results
+            if request_id == self._latest:
+                results.append((signature, analysis))
+
+    def stop(self):
+        """Ask the worker thread to exit."""
+        self._requests.put(None)
+
+    def _run(self):
+        while True:
+            item = self._requests.get()
+            # Skip ahead to the newest queued request; older ones are stale
+            while item is not None and not self._requests.empty():
+                item = self._requests.get()
+            if item is None:
+                return
+
+            request_id, signature = item
+            if request_id != self._latest:
+                continue
+            hand_counts, meld_counts = dict(signature[0]), dict(signature[1])
+            analysis = analyze_hand(hand_counts, meld_counts)
+            with self._lock:
+                self._cache[signature] = analysis
+                self._cache.move_to_end(signature)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+                if request_id == self._latest:
+                    self._results.put((request_id, signature, analysis))
@@ -0,0 +1,176 @@
+"""
+Batch hand evaluation module for PokeJong.
+Pure, vectorized evaluation of many hands at once from count vectors: whether
+each hand wins, which tiles it waits on, and the score calculate_win_score
+would award. Nothing here touches Player or PokeJongGame state or prints.
+
+Species are columns: column i is pokemon_id i + 1.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from scoring_rules import ScoringRules, default_rules
+
+
+def species_points(num_pokemon: int, rules: Optional[ScoringRules] = None) -> np.ndarray:
+    """Point value per species column from the scoring rules (default: default_rules()), as PokemonTileFactory assigns them."""
+    rules = rules or default_rules()
+    return np.array([rules.points_for(pokemon_id) for pokemon_id in range(1, num_pokemon + 1)], dtype=np.int64)
+
+
+def winning_mask(totals: np.ndarray) -> np.ndarray:
+    """
+    Vectorized 4 Melds + 1 Pair check over rows of count vectors.
+    
+    A hand wins when it holds 14 tiles, no species count is 1 mod 3 and exactly
+    one species count is 2 mod 3 (the pair), the same rule as is_winning_counts.
+    """
+    mod = totals % 3
+    return ((mod == 1).sum(axis=-1) == 0) & ((mod == 2).sum(axis=-1) == 1) & (totals.sum(axis=-1) == 14)
+
+
+def waits_mask(totals: np.ndarray) -> np.ndarray:
+    """
+    For 13-tile rows, mark every species whose next copy would complete the hand.
+    
+    Adding one tile only changes that species' count mod 3, so the win test is
+    updated per column instead of re-run: O(B x N) for the whole batch.
+    """
+    mod = totals % 3
+    ones = (mod == 1).sum(axis=1, keepdims=True)
+    twos = (mod == 2).sum(axis=1, keepdims=True)
+    new_mod = (mod + 1) % 3
+    ones_after = ones - (mod == 1) + (new_mod == 1)
+    twos_after = twos - (mod == 2) + (new_mod == 2)
+    thirteen = totals.sum(axis=1, keepdims=True) == 13
+    return (ones_after == 0) & (twos_after == 1) & thirteen
+
+
+def _condition_mask(name: str, value, counts: np.ndarray, meld_counts: np.ndarray, num_melds: np.ndarray,
+                    is_ron: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Row mask for one bonus condition; the vectorized form of scoring_rules._compile_condition."""
+    if name == 'melds':
+        return num_melds == value
+    if name == 'min_melds':
+        return num_melds >= value
+    if name == 'min_kongs':
+        # Only 4 copies of a species exist, so 4 meld tiles of one species are a Kong
+        return (meld_counts == 4).sum(axis=1) >= value
+    if name == 'max_species':
+        return (counts > 0).sum(axis=1) <= value
+    if name == 'min_points':
+        return ~((counts > 0) & (points < value)).any(axis=1)
+    if name == 'win_type':
+        return is_ron == (value == 'Ron')
+    raise ValueError(f"Unknown scoring condition: {name}")
+
+
+def bonus_points(rules: ScoringRules, counts: np.ndarray, meld_counts: np.ndarray, num_melds: np.ndarray,
+                 is_ron: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    Total of the rules' bonuses each row earns, as ScoringRules.score awards them.
+    
+    Args:
+        rules: Scoring rules whose bonuses apply
+        counts: (B, N) tiles per species across hand, melds and the winning tile
+        meld_counts: (B, N) tiles in melds per species
+        num_melds: (B,) number of melds
+        is_ron: (B,) True for Ron wins
+        points: (N,) points per species
+        
+    Returns:
+        (B,) bonus points per row
+    """
+    bonus = np.zeros(counts.shape[0], dtype=np.int64)
+    for entry in rules.config.get('bonuses', []):
+        awarded = np.ones(counts.shape[0], dtype=bool)
+        for name, value in entry.get('when', {}).items():
+            awarded &= _condition_mask(name, value, counts, meld_counts, num_melds, is_ron, points)
+        bonus += np.where(awarded, entry['points'], 0)
+    return bonus
+
+
+def _evaluate_chunk(hand_counts: np.ndarray, meld_counts: np.ndarray, num_melds: np.ndarray,
+                    winning_tiles: np.ndarray, is_ron: np.ndarray, points: np.ndarray,
+                    rules: ScoringRules) -> Dict[str, np.ndarray]:
+    """Evaluate one chunk of rows (see evaluate_hands)."""
+    rows = np.arange(hand_counts.shape[0])
+    totals = hand_counts + meld_counts
+    with_claim = totals.copy()
+    ron_rows = rows[is_ron & (winning_tiles >= 0)]
+    with_claim[ron_rows, winning_tiles[ron_rows]] += 1
+
+    is_win = winning_mask(with_claim)
+    waits = waits_mask(totals)
+
+    # Base points as in calculate_win_score: hand + melds + the winning tile again
+    # (for Tsumo the hand already contains it, which the game counts twice too)
+    base = (hand_counts * points).sum(axis=1) + (meld_counts * points).sum(axis=1)
+    base += np.where(winning_tiles >= 0, points[np.clip(winning_tiles, 0, None)], 0)
+    bonus = bonus_points(rules, with_claim, meld_counts, num_melds, is_ron, points)
+    multiplier = np.where(is_ron, rules.multipliers['Ron'], rules.multipliers['Tsumo'])
+    score = np.where(is_win, np.floor((base + bonus) * multiplier), 0).astype(np.int64)
+
+    return {
+        'is_win': is_win,
+        'waits': waits,
+        'num_waits': waits.sum(axis=1),
+        'base_points': np.where(is_win, base, 0),
+        'bonus': np.where(is_win, bonus, 0),
+        'score': score,
+    }
+
+
+def evaluate_hands(hand_counts: np.ndarray, meld_counts: Optional[np.ndarray] = None,
+                   num_melds: Optional[np.ndarray] = None, winning_tiles: Optional[np.ndarray] = None,
+                   win_type: Union[str, np.ndarray] = 'Tsumo', points: Optional[np.ndarray] = None,
+                   rules: Optional[ScoringRules] = None, workers: Optional[int] = None, chunk_size: int = 100000) -> Dict[str, np.ndarray]:
+    """
+    Evaluate a batch of hands.
+    
+    Args:
+        hand_counts: (B, N) tiles in hand per species
+        meld_counts: (B, N) tiles in melds per species (default: none)
+        num_melds: (B,) number of melds (default: species with meld tiles)
+        winning_tiles: (B,) species column of the winning tile. For Ron this is the
+            claimed tile (not in hand_counts). For Tsumo it defaults to the highest
+            species in hand (player.hand[-1] after sort_hand()) for rows
+            left as -1.
+        win_type: 'Tsumo', 'Ron', or a (B,) array of those strings
+        points: (N,) points per species (default: species_points from rules)
+        rules: Bonuses and win type multipliers to score with (default: default_rules())
+        workers: If set, split rows into chunks evaluated in that many processes
+        chunk_size: Rows per chunk when workers is set
+        
+    Returns:
+        Dictionary of arrays: 'is_win' (B,), 'waits' (B, N) for 13-tile rows,
+        'num_waits' (B,), and for winning rows 'base_points', 'bonus' and the
+        'score' calculate_win_score would add (0 for non-winning rows)
+    """
+    hand_counts = np.asarray(hand_counts, dtype=np.int64)
+    batch, num_pokemon = hand_counts.shape
+    meld_counts = np.zeros_like(hand_counts) if meld_counts is None else np.asarray(meld_counts, dtype=np.int64)
+    if num_melds is None:
+        num_melds = (meld_counts > 0).sum(axis=1)
+    num_melds = np.asarray(num_melds)
+    is_ron = np.broadcast_to(np.asarray(win_type) == 'Ron', (batch,))
+    winning_tiles = np.full(batch, -1) if winning_tiles is None else np.asarray(winning_tiles, dtype=np.int64)
+    highest = num_pokemon - 1 - np.argmax(hand_counts[:, ::-1] > 0, axis=1)
+    winning_tiles = np.where((winning_tiles < 0) & hand_counts.any(axis=1) & ~is_ron, highest, winning_tiles)
+    rules = rules or default_rules()
+    points = species_points(num_pokemon, rules) if points is None else np.asarray(points, dtype=np.int64)
+
+    args = (hand_counts, meld_counts, num_melds, winning_tiles, is_ron)
+    if not workers or batch <= chunk_size:
+        return _evaluate_chunk(*args, points, rules)
+
+    bounds = list(range(0, batch, chunk_size))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_evaluate_chunk, *(a[start:start + chunk_size] for a in args),
+                                   points, rules)
+                   for start in bounds]
+        parts = [future.result() for future in futures]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
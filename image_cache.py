@@ -0,0 +1,140 @@
+"""
+Image cache module for PokeJong.
+A byte-budgeted LRU cache for decoded tile images used by the GUI.
+"""
+
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Default budget: roughly 200 tiles at 80x100 RGBA
+DEFAULT_IMAGE_CACHE_BYTES = 200 * 80 * 100 * 4
+
+
+def image_size_bytes(image: Any) -> int:
+    """Estimate the decoded size of a PIL or Tk image as width x height x 4 bytes."""
+    width = image.width() if callable(getattr(image, 'width', None)) else image.width
+    height = image.height() if callable(getattr(image, 'height', None)) else image.height
+    return width * height * 4
+
+
+class ImageCache:
+    """LRU cache of decoded images bounded by a total byte budget.
+    
+    Images that are pinned (currently on screen) are never evicted, so the cache
+    may exceed its budget while every remaining entry is pinned.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_IMAGE_CACHE_BYTES):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_bytes: Total decoded size the cache tries to stay under
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._pins: Counter = Counter()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached image for key (marking it recently used), or None."""
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: Hashable, image: Any, size_bytes: Optional[int] = None):
+        """
+        Insert or replace an image, then evict least recently used entries over budget.
+        
+        Args:
+            key: Cache key (usually the pokemon_id)
+            image: The decoded image
+            size_bytes: Decoded size; estimated from the image dimensions if omitted
+        """
+        if key in self._entries:
+            self.current_bytes -= self._sizes[key]
+        self._entries[key] = image
+        self._entries.move_to_end(key)
+        self._sizes[key] = size_bytes if size_bytes is not None else image_size_bytes(image)
+        self.current_bytes += self._sizes[key]
+        self._evict()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], pin: bool = False) -> Any:
+        """
+        Return the cached image for key, calling loader() and caching its result on a miss.
+        
+        Args:
+            key: Cache key (usually the pokemon_id)
+            loader: Produces the image on a miss
+            pin: Pin key before inserting, so a cache already full of pinned
+                images cannot evict the new image on the way in
+        """
+        if pin:
+            self.pin(key)
+        try:
+            image = self.get(key)
+            if image is None:
+                image = loader()
+                self.put(key, image)
+        except Exception:
+            if pin:
+                self.unpin(key)
+            raise
+        return image
+
+    def pin(self, key: Hashable):
+        """Protect key from eviction until a matching unpin()."""
+        self._pins[key] += 1
+
+    def unpin(self, key: Hashable):
+        """Release one pin on key and evict if the cache is now over budget."""
+        if key not in self._pins:
+            return
+        if self._pins[key] == 1:
+            del self._pins[key]
+        else:
+            self._pins[key] -= 1
+        self._evict()
+
+    def clear(self):
+        """Drop every entry (e.g. placeholders that are being replaced); pin counts are kept."""
+        self._entries.clear()
+        self._sizes.clear()
+        self.current_bytes = 0
+
+    def _evict(self):
+        """Drop unpinned entries, least recently used first, until within budget."""
+        if self.current_bytes <= self.max_bytes:
+            return
+        for key in list(self._entries):
+            if self.current_bytes <= self.max_bytes:
+                break
+            if self._pins[key] > 0:
+                continue
+            del self._entries[key]
+            self.current_bytes -= self._sizes.pop(key)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and eviction counters plus current usage."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+        }
@@ -4,12 +4,16 @@ PokeJong - A Pokemon-themed 2-player Mahjong game.
 Main entry point for the game.
 """
 
+import os
 import tkinter as tk
 import requests
 
 from game import PokeJongGame
 from pokemongui import GameUI
 
+# Output of preprocess_sprites.py; used when present so sprites load without resizing
+SPRITE_DIR = "sprites"
+
 def start_gui():
     print("Starting PokéJong GUI...")
 
@@ -18,16 +22,17 @@ def start_gui():
     game = PokeJongGame(player1_name="Ash Ketchum", player2_name="Nurse Joy") 
     
     try:
-        # Set up the game and fetch initial Pokémon data
+        # Set up the game; Pokémon names are fetched in the background while play starts
         # num_pokemon set to low for faster initial load
-        game.setup_game(num_pokemon=20) 
+        game.setup_game(num_pokemon=20, lazy_names=True) 
         
         # Player 1 (Dealer) draws 14 tiles to start the game
         game.draw_tile() 
 
         # --- 2. Initialize and Run the GUI ---
         # The GameUI class is passed the Tkinter root and the game object
-        app = GameUI(root, game) 
+        sprite_dir = SPRITE_DIR if os.path.exists(os.path.join(SPRITE_DIR, "index.json")) else None
+        app = GameUI(root, game, sprite_dir=sprite_dir) 
         
         # Start the Tkinter event loop - this keeps the window open and responsive
         root.mainloop() 
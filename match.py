@@ -0,0 +1,134 @@
+"""
+Match module for PokeJong.
+Plays several rounds (hands) between the same two players with dealer rotation
+and cumulative scores. Species data is fetched once per match, and the next
+round's shuffled wall is built on a background thread while the current round
+is played, so starting a new round only has to deal.
+"""
+
+import random
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from game import PokeJongGame
+from pokemon_tile import PokemonTile, PokemonTileFactory
+from tile_source import StubSource, TileDataSource
+
+
+class PokeJongMatch:
+    """A multi-round match between two players."""
+
+    def __init__(self, player1_name: str = "Player 1", player2_name: str = "Player 2", num_rounds: int = 4,
+                 num_pokemon: int = 20, offline: bool = False, source: Optional[TileDataSource] = None,
+                 seed: Optional[int] = None, rules: Optional[Dict[str, float]] = None):
+        """
+        Initialize a match.
+
+        Args:
+            player1_name: Name of the first player
+            player2_name: Name of the second player
+            num_rounds: Number of rounds to play
+            num_pokemon: Number of different Pokemon in the tile set
+            offline: Skip PokeAPI entirely and use placeholder names
+            source: Where to fetch species data (default: PokeAPI)
+            seed: Seed for the wall shuffles; the same seed replays the same walls
+            rules: Optional PokeJongGame attribute overrides applied to every round
+        """
+        self.player_names = [player1_name, player2_name]
+        self.num_rounds = num_rounds
+        self.num_pokemon = num_pokemon
+        self.source = StubSource() if offline else source
+        self.rules = rules or {}
+        self.scores = [0, 0]
+        self.dealer = 0  # Seat index of this round's dealer, who plays first
+        self.round_number = 0
+        self.results: List[Dict] = []
+        self.species: Optional[List[PokemonTile]] = None
+
+        self._rng = random.Random(seed)
+        self._builder = ThreadPoolExecutor(max_workers=1)
+        self._next_wall: Optional[Future] = None
+
+    @property
+    def match_over(self) -> bool:
+        """True once every round has been finished."""
+        return len(self.results) >= self.num_rounds
+
+    def start(self):
+        """Fetch species data once and start shuffling the first wall."""
+        if self.species is None:
+            print("Fetching Pokemon data for the match...")
+            self.species = PokemonTileFactory.create_species(self.num_pokemon, self.source)
+        if self._next_wall is None:
+            self._prepare_next_wall()
+
+    def _prepare_next_wall(self):
+        """Build the next round's wall on the background thread."""
+        # Seeds are drawn here, not on the builder thread, so walls replay in order
+        rng = random.Random(self._rng.getrandbits(64))
+        self._next_wall = self._builder.submit(PokemonTileFactory.build_wall, self.species, 4, rng)
+
+    def next_round(self) -> PokeJongGame:
+        """
+        Start the next round with the pre-built wall.
+
+        Returns:
+            A dealt PokeJongGame whose current player is this round's dealer
+        """
+        if self.match_over:
+            raise RuntimeError("The match is over")
+        self.start()
+        wall = self._next_wall.result()
+        if len(self.results) + 1 < self.num_rounds:
+            self._prepare_next_wall()
+        else:
+            self._next_wall = None
+
+        self.round_number = len(self.results) + 1
+        game = PokeJongGame(*self.player_names)
+        for name, value in self.rules.items():
+            setattr(game, name, value)
+        if self.dealer == 1:
+            game.switch_turn()
+        game.deal(wall)
+        print(f"Round {self.round_number} of {self.num_rounds}: {game.current_player.name} deals.")
+        return game
+
+    def finish_round(self, game: PokeJongGame) -> Dict:
+        """
+        Add a finished round's scores to the match totals and rotate the dealer.
+
+        Args:
+            game: The round returned by next_round
+
+        Returns:
+            Dictionary with 'round', 'dealer', 'winner' (seat index or None),
+            'win_type' and the round's 'scores'
+        """
+        seats = {game.player1: 0, game.player2: 1}
+        round_scores = (game.player1.score, game.player2.score)
+        for seat, score in enumerate(round_scores):
+            self.scores[seat] += score
+
+        result = {
+            'round': self.round_number,
+            'dealer': self.dealer,
+            'winner': seats[game.winner] if game.winner else None,
+            'win_type': game.win_type,
+            'scores': round_scores,
+        }
+        self.results.append(result)
+        self.dealer = 1 - self.dealer
+        if self.match_over:
+            self.close()
+        return result
+
+    def winner(self) -> Optional[str]:
+        """Name of the player with the higher cumulative score, or None for a tie."""
+        if self.scores[0] == self.scores[1]:
+            return None
+        return self.player_names[0 if self.scores[0] > self.scores[1] else 1]
+
+    def close(self):
+        """Stop the background wall builder."""
+        self._builder.shutdown(wait=False)
@@ -5,6 +5,7 @@ Handles player state and actions.
 from typing import List, Optional  
 from collections import Counter
 from pokemon_tile import PokemonTile
+from zobrist import HAND, MELDS, toggle
 
 
 class Player:
@@ -24,12 +25,46 @@ class Player:
         self.discards: List[PokemonTile] = [] # Discarded tiles
         self.melds: List[List[PokemonTile]] = []  # Matched tiles
         self.score: int = 0
+        # Sparse pokemon_id -> count map of the hand, kept in step with self.hand
+        self.hand_counts: Counter = Counter()
+        # Same for every tile in melds (a Pung adds 3, a Kong 4)
+        self.meld_counts: Counter = Counter()
+        # Running point totals of the hand and melds, so scoring never re-sums tiles
+        self.hand_points: int = 0
+        self.meld_points: int = 0
+        # Zobrist hashes of the hand and melds, updated tile by tile (see state_key)
+        self.hand_hash: int = 0
+        self.meld_hash: int = 0
     
     def draw_tile(self, tile: PokemonTile):
         """Add a tile to the player's hand."""
         self.hand.append(tile)
+        self.hand_counts[tile.pokemon_id] += 1
+        self.hand_points += tile.points
+        self.hand_hash = toggle(self.hand_hash, HAND, self.player_id, tile.pokemon_id, self.hand_counts[tile.pokemon_id])
         self.sort_hand()
 
+    def _remove_count(self, tile: PokemonTile):
+        """Drop one copy of tile from hand_counts, keeping the map sparse."""
+        self.hand_hash = toggle(self.hand_hash, HAND, self.player_id, tile.pokemon_id, self.hand_counts[tile.pokemon_id])
+        self.hand_counts[tile.pokemon_id] -= 1
+        self.hand_points -= tile.points
+        if self.hand_counts[tile.pokemon_id] <= 0:
+            del self.hand_counts[tile.pokemon_id]
+
+    def _add_meld(self, meld: List[PokemonTile]):
+        """Record a new meld in melds, meld_counts, meld_points and meld_hash."""
+        self.melds.append(meld)
+        for tile in meld:
+            self.meld_counts[tile.pokemon_id] += 1
+            self.meld_points += tile.points
+            self.meld_hash = toggle(self.meld_hash, MELDS, self.player_id, tile.pokemon_id,
+                                    self.meld_counts[tile.pokemon_id])
+
+    def state_key(self) -> int:
+        """64-bit Zobrist key of this player's hand and melds (tile order is ignored)."""
+        return self.hand_hash ^ self.meld_hash
+
     def sort_hand(self):
         """Sorts the hand for easier visualization/logic."""
         # Sorting by ID ensures identical tiles are grouped.
@@ -48,6 +83,7 @@ class Player:
         try:
             if 0 <= tile_index < len(self.hand):
                 discarded_tile = self.hand.pop(tile_index)
+                self._remove_count(discarded_tile)
                 self.discards.append(discarded_tile)
                 return discarded_tile
             else:
@@ -88,8 +124,9 @@ class Player:
         new_meld = []
         for index in sorted(tile_indices, reverse=True): # Remove in reverse order to keep indices correct
             new_meld.append(self.hand.pop(index))
+            self._remove_count(new_meld[-1])
         
-        self.melds.append(new_meld)
+        self._add_meld(new_meld)
         self.score += sum(t.points for t in new_meld) # Add score for the new meld
         self.sort_hand()
         return True
@@ -103,10 +140,10 @@ class Player:
             # Need to find and remove the actual tile object from hand
             for i, hand_tile in enumerate(self.hand):
                 if hand_tile == tile:
-                    self.hand.pop(i)
+                    self._remove_count(self.hand.pop(i))
                     break
         
-        self.melds.append(new_meld)
+        self._add_meld(new_meld)
         self.sort_hand()
 
         meld_points = sum(t.points for t in new_meld)
@@ -0,0 +1,304 @@
+"""
+PokeAPI client module for PokeJong.
+Wraps HTTP access with retries, a circuit breaker and conditional requests.
+"""
+
+import codecs
+import json
+import random
+import threading
+import time
+import requests
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# HTTP statuses worth retrying: rate limiting and server-side hiccups
+TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+# Read size for streamed list responses
+LIST_CHUNK_BYTES = 16 * 1024
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of making a request while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Fails fast after repeated failures, then lets a single probe through after a cool-down.
+    
+    States: 'closed' (requests flow), 'open' (requests rejected) and 'half-open'
+    (one trial request allowed; success closes the circuit, failure reopens it).
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the breaker.
+        
+        Args:
+            failure_threshold: Consecutive failed calls before the circuit opens
+            reset_timeout: Seconds to stay open before allowing a probe
+            clock: Time source (seconds), injectable for tests
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be attempted now."""
+        with self._lock:
+            if self.state == 'open' and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = 'half-open'
+                return True
+            return self.state == 'closed'
+
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit at the threshold or after a failed probe."""
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half-open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = self.clock()
+
+
+class PokeAPIClient:
+    """Resilient JSON client for PokeAPI.
+    
+    - Transient errors (connection errors, timeouts, 429/5xx) are retried with
+      exponential backoff and jitter.
+    - A CircuitBreaker rejects calls outright once the service looks down.
+    - Responses are remembered with their ETag/Last-Modified validators, so
+      refreshing a cached document sends a conditional request and a 304 reply
+      is served from memory. Streamed list pages are revalidated the same way.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, timeout: float = 5,
+                 max_retries: int = 2, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 breaker: Optional[CircuitBreaker] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the client.
+        
+        Args:
+            session: HTTP session to reuse (a new one is created if omitted)
+            timeout: Per-request timeout in seconds
+            max_retries: Retries after the first attempt for transient errors
+            backoff_base: Delay before the first retry; doubles on each retry
+            backoff_max: Upper bound for a single backoff delay
+            breaker: Circuit breaker shared by all calls through this client
+            sleep: Sleep function, injectable for tests
+        """
+        if session is None:
+            session = requests.Session()
+            # Room for the concurrent fetches made on large boards
+            session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=32))
+        self.session = session
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.sleep = sleep
+        # url -> (etag, last_modified, json document)
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str], Dict]] = {}
+        # (url, key) -> (etag, last_modified, list entries) for iter_list
+        self._list_validators: Dict[Tuple[str, str], Tuple[Optional[str], Optional[str], List[Dict]]] = {}
+        self._lock = threading.Lock()
+
+    def _backoff(self, attempt: int) -> float:
+        """Delay before retry number attempt (0-based), with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _conditional_headers(self, cache_key, validators: Optional[Dict] = None) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers from a previous response stored under cache_key."""
+        validators = self._validators if validators is None else validators
+        with self._lock:
+            cached = validators.get(cache_key)
+        if not cached:
+            return {}
+        etag, last_modified, _ = cached
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def _get(self, url: str, headers: Optional[Dict[str, str]] = None, stream: bool = False) -> requests.Response:
+        """
+        GET url with retries for transient errors, behind the circuit breaker.
+        Every exit records an outcome with the breaker, so a half-open probe that
+        fails in an unexpected way still reopens the circuit.
+        
+        Returns:
+            The response (200 or 304)
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            requests.RequestException: If the request ultimately failed
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f"PokeAPI circuit open, skipping {url}")
+
+        last_error: Optional[requests.RequestException] = None
+        answered = False
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    self.sleep(self._backoff(attempt - 1))
+                try:
+                    response = self.session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    last_error = e
+                    continue
+
+                if response.status_code in TRANSIENT_STATUSES:
+                    last_error = requests.HTTPError(f"{response.status_code} for {url}", response=response)
+                    continue
+
+                # The service answered (even with e.g. a 404, which is not retried), so it is up
+                answered = True
+                response.raise_for_status()
+                return response
+
+            raise last_error
+        finally:
+            if answered:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+    def get_json(self, url: str) -> Dict:
+        """
+        GET a JSON document with retries, circuit breaking and revalidation.
+        
+        Args:
+            url: Absolute URL to fetch
+            
+        Returns:
+            The decoded JSON document
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            requests.RequestException: If the request ultimately failed
+        """
+        headers = self._conditional_headers(url)
+        response = self._get(url, headers=headers)
+
+        if response.status_code == 304:
+            # Only a conditional request can be answered from memory
+            if not headers:
+                raise requests.HTTPError(f"Unexpected 304 for unconditional request to {url}", response=response)
+            with self._lock:
+                return self._validators[url][2]
+
+        data = response.json()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            with self._lock:
+                self._validators[url] = (etag, last_modified, data)
+        return data
+
+    def iter_list(self, url: str, key: str = 'results') -> Iterator[Dict]:
+        """
+        Stream the entries of a paginated list response (e.g. /pokemon?limit=N).
+        
+        The body is decoded as it arrives and each entry of the key array is
+        yielded on its own, so the whole document is never held in memory. Pages
+        served with validators keep their entries, so asking again sends a
+        conditional request and a 304 replays them without a download.
+        
+        Args:
+            url: Absolute URL of the list page
+            key: Name of the array to read
+            
+        Returns:
+            Iterator over the array's entries
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            requests.RequestException: If the request ultimately failed
+        """
+        cache_key = (url, key)
+        headers = self._conditional_headers(cache_key, self._list_validators)
+        response = self._get(url, headers=headers, stream=True)
+
+        if response.status_code == 304:
+            response.close()
+            if not headers:
+                raise requests.HTTPError(f"Unexpected 304 for unconditional request to {url}", response=response)
+            with self._lock:
+                entries = self._list_validators[cache_key][2]
+            yield from entries
+            return
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        entries = [] if etag or last_modified else None
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        chunks = (decoder.decode(chunk) for chunk in response.iter_content(chunk_size=LIST_CHUNK_BYTES))
+        try:
+            for entry in iter_json_array(chunks, key):
+                if entries is not None:
+                    entries.append(entry)
+                yield entry
+        finally:
+            response.close()
+        # Only a page read to the end is worth revalidating against
+        if entries is not None:
+            with self._lock:
+                self._list_validators[cache_key] = (etag, last_modified, entries)
+
+
+def iter_json_array(chunks: Iterable[str], key: str) -> Iterator:
+    """
+    Incrementally parse the array stored under key in a JSON object.
+    
+    Args:
+        chunks: The document's text in pieces of any size
+        key: Name of the array member
+        
+    Returns:
+        Iterator over the array's elements, each yielded as soon as it is complete
+    """
+    decoder = json.JSONDecoder()
+    marker = f'"{key}"'
+    buffer = ''
+    in_array = False
+    for chunk in chunks:
+        buffer += chunk
+        if not in_array:
+            start = buffer.find(marker)
+            bracket = buffer.find('[', start + len(marker)) if start >= 0 else -1
+            if bracket < 0:
+                # Keep enough text to match a marker split across chunks
+                if start < 0:
+                    buffer = buffer[-len(marker):]
+                continue
+            buffer = buffer[bracket + 1:]
+            in_array = True
+
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position >= len(buffer):
+                break
+            if buffer[position] == ']':
+                return
+            try:
+                element, position = decoder.raw_decode(buffer, position)
+            except ValueError:
+                break  # The element continues in the next chunk
+            yield element
+        buffer = buffer[position:]
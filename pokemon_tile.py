@@ -1,30 +1,48 @@
 """
 Pokemon Tile module for PokeJong game.
-Handles fetching Pokemon data from PokeAPI and creating tiles.
+Handles fetching Pokemon data (from PokeAPI by default) and creating tiles.
 """
 
-import requests
 import random
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
+from tile_source import TileDataSource, PokeAPISource, StubSource
+from scoring_rules import ScoringRules, default_rules
 
 
 class PokemonTile:
     """Represents a Pokemon-themed Mahjong tile."""
     
-    def __init__(self, pokemon_id: int, name: str, points: int):
+    def __init__(self, pokemon_id: int, name: Optional[str] = None, points: Optional[int] = None,
+                 names: Optional[Dict[int, str]] = None):
         """
         Initialize a Pokemon tile.
         
         Args:
             pokemon_id: The Pokemon's ID number
-            name: The Pokemon's name
-            points: Points value (5 or 10)
+            name: The Pokemon's name; None to look it up in names (or show a
+                placeholder until the name is resolved)
+            points: Points value (5 or 10); None to look it up from the ID
+            names: Species names filled in later, e.g. a TileNameResolver's names;
+                shared by every copy of the tile
         """
         self.pokemon_id = pokemon_id
-        self.name = name.capitalize()
-        self.points = points
+        self._name = name.capitalize() if name else None
+        self._names = names
+        self.points = points if points is not None else default_rules().points_for(pokemon_id)
         self.image_url = "https://unpkg.com/pokeapi-sprites@2.0.2/sprites/pokemon/other/dream-world/"
     
+    @property
+    def name(self) -> str:
+        """The Pokemon's name, or 'Pokemon<id>' while a lazily named tile is unresolved."""
+        if self._name is not None:
+            return self._name
+        resolved = self._names.get(self.pokemon_id) if self._names is not None else None
+        return resolved.capitalize() if resolved else f"Pokemon{self.pokemon_id}"
+
+    def copy(self, points: Optional[int] = None) -> 'PokemonTile':
+        """Another copy of this tile (optionally worth other points); lazily named tiles stay lazy."""
+        return PokemonTile(self.pokemon_id, self._name, self.points if points is None else points, self._names)
+
     def __repr__(self):
         return f"[{self.name} #{self.pokemon_id}:{self.points}pts]"
     
@@ -35,14 +53,17 @@ class PokemonTile:
 
 
 class PokemonTileFactory:
-    """Factory class to create Pokemon tiles using PokeAPI."""
+    """Factory class to create Pokemon tiles from a tile data source (PokeAPI by default)."""
     
     BASE_URL = "https://pokeapi.co/api/v2/pokemon"
+    # Default source: the live PokeAPI behind a client that retries transient
+    # errors and fails fast once PokeAPI is down
+    source: TileDataSource = PokeAPISource(BASE_URL)
     
     @staticmethod
     def fetch_pokemon(pokemon_id: int) -> Optional[Dict]:
         """
-        Fetch Pokemon data from PokeAPI.
+        Fetch Pokemon data from the default source.
         
         Args:
             pokemon_id: The Pokemon ID to fetch
@@ -50,61 +71,138 @@ class PokemonTileFactory:
         Returns:
             Dictionary containing Pokemon data
         """
-        try:
-            response = requests.get(f"{PokemonTileFactory.BASE_URL}/{pokemon_id}", timeout=5)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"Error fetching Pokemon {pokemon_id}: {e}")
-            return None
+        return PokemonTileFactory.source.fetch_pokemon(pokemon_id)
     
     @staticmethod
-    def create_tile(pokemon_id: int) -> PokemonTile:
+    def create_tile(pokemon_id: int, source: Optional[TileDataSource] = None,
+                    rules: Optional[ScoringRules] = None) -> PokemonTile:
         """
-        Create a Pokemon tile from PokeAPI data.
+        Create a Pokemon tile from source data.
         
         Args:
             pokemon_id: The Pokemon ID to create a tile for
+            source: Where to fetch species data (default: PokeAPI)
+            rules: Scoring rules whose point table prices the tile (default: default_rules())
             
         Returns:
             PokemonTile instance
         """
-        data = PokemonTileFactory.fetch_pokemon(pokemon_id)
-        if data:
-            name = data['name']
-            # Assign points based on Pokemon ID (arbitrary rule for game balance)
-            # Lower ID Pokemon (1-50) get 5 points, higher ID (51+) get 10 points
-            points = 5 if pokemon_id <= 50 else 10
-            image_url = data['sprites']['other']['official-artwork']['front_default']
+        source = source or PokemonTileFactory.source
+        return PokemonTileFactory._tile_from_data(pokemon_id, source.fetch_pokemon(pokemon_id), rules)
+
+    @staticmethod
+    def _tile_from_data(pokemon_id: int, data: Optional[Dict], rules: Optional[ScoringRules] = None) -> PokemonTile:
+        """Build a tile from a species document, or a fallback tile if data is None."""
+        # Assign points from the scoring rules' point table (by default
+        # lower ID Pokemon (1-50) get 5 points, higher ID (51+) get 10 points)
+        return PokemonTileFactory._tile_from_name(pokemon_id, data['name'] if data else None, rules)
+
+    @staticmethod
+    def _tile_from_name(pokemon_id: int, name: Optional[str], rules: Optional[ScoringRules] = None) -> PokemonTile:
+        """Build a tile from a species name, or a fallback tile if name is None."""
+        points = (rules or default_rules()).points_for(pokemon_id)
+        if name:
             return PokemonTile(pokemon_id, name, points)
         else:
-            # Fallback if API fails
-            FALLBACK_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/items/poke-ball.png"
-            return PokemonTile(pokemon_id, f"Pokemon{pokemon_id}", 5)
+            # Fallback if the source has no data
+            return PokemonTile(pokemon_id, f"Pokemon{pokemon_id}", points)
     
     @staticmethod
-    def create_tile_set(num_pokemon: int = 20, num_copies: int = 4) -> List[PokemonTile]:
+    def fetch_names(pokemon_ids: Iterable[int], source: Optional[TileDataSource] = None) -> Dict[int, Optional[str]]:
         """
-        Create a set of Pokemon tiles for Mahjong.
-        In traditional Mahjong, each tile appears 4 times.
+        Fetch just the names of many Pokemon (paginated list requests for the PokeAPI source).
         
         Args:
-            num_pokemon: Number of different Pokemon to use
+            pokemon_ids: The Pokemon IDs to name
+            source: Where to fetch species data (default: PokeAPI)
+            
+        Returns:
+            Dictionary mapping each ID to its name (None if the fetch failed)
+        """
+        source = source or PokemonTileFactory.source
+        return source.fetch_names(pokemon_ids)
+
+    @staticmethod
+    def build_wall(species: List[PokemonTile], num_copies: int = 4, rng: Optional[random.Random] = None) -> List[PokemonTile]:
+        """
+        Expand one tile per species into num_copies tiles each and shuffle them.
+        
+        Args:
+            species: One template tile per Pokemon
             num_copies: Number of copies of each Pokemon tile
+            rng: Random generator to shuffle with; a seeded one gives a reproducible wall
             
         Returns:
             List of PokemonTile instances
         """
         tiles = []
-        # Use first num_pokemon Pokemon from the API
-        pokemon_ids = list(range(1, num_pokemon + 1))
-        
-        for pokemon_id in pokemon_ids:
-            tile = PokemonTileFactory.create_tile(pokemon_id)
+        for tile in species:
             # Create multiple copies of each tile (like Mahjong)
             for _ in range(num_copies):
-                tiles.append(PokemonTile(tile.pokemon_id, tile.name, tile.points))
+                tiles.append(tile.copy())
         
         # Shuffle the tiles
-        random.shuffle(tiles)
+        (rng or random).shuffle(tiles)
         return tiles
+
+    @staticmethod
+    def create_tile_set(num_pokemon: int = 20, num_copies: int = 4, offline: bool = False,
+                        source: Optional[TileDataSource] = None,
+                        rules: Optional[ScoringRules] = None) -> List[PokemonTile]:
+        """
+        Create a set of Pokemon tiles for Mahjong.
+        In traditional Mahjong, each tile appears 4 times.
+        
+        Args:
+            num_pokemon: Number of different Pokemon to use
+            num_copies: Number of copies of each Pokemon tile
+            offline: Use the in-process StubSource (placeholder names, no network)
+            source: Where to fetch species data (default: PokeAPI)
+            rules: Scoring rules whose point table prices the tiles (default: default_rules())
+            
+        Returns:
+            List of PokemonTile instances
+        """
+        if offline:
+            source = StubSource()
+        # Use first num_pokemon Pokemon from the source; PokeAPI names them all with one list request
+        species = PokemonTileFactory.create_species(num_pokemon, source, rules)
+        return PokemonTileFactory.build_wall(species, num_copies)
+
+    @staticmethod
+    def create_species_lazy(num_pokemon: int = 20, names: Optional[Dict[int, str]] = None,
+                            rules: Optional[ScoringRules] = None) -> List[PokemonTile]:
+        """
+        Create one template tile per species from IDs alone, without any fetch.
+        Names show as placeholders until a TileNameResolver fills them in.
+        
+        Args:
+            num_pokemon: Number of different Pokemon to use
+            names: Where the tiles look up their names (e.g. TileNameResolver.names)
+            rules: Scoring rules whose point table prices the tiles (default: default_rules())
+            
+        Returns:
+            List of PokemonTile instances, one per Pokemon ID
+        """
+        rules = rules or default_rules()
+        return [PokemonTile(pokemon_id, points=rules.points_for(pokemon_id), names=names)
+                for pokemon_id in range(1, num_pokemon + 1)]
+
+    @staticmethod
+    def create_species(num_pokemon: int = 20, source: Optional[TileDataSource] = None,
+                       rules: Optional[ScoringRules] = None) -> List[PokemonTile]:
+        """
+        Fetch one template tile per species in a single batch, for build_wall to copy.
+        For PokeAPI this is one paginated list request rather than a request per species.
+        
+        Args:
+            num_pokemon: Number of different Pokemon to use
+            source: Where to fetch species data (default: PokeAPI)
+            rules: Scoring rules whose point table prices the tiles (default: default_rules())
+            
+        Returns:
+            List of PokemonTile instances, one per Pokemon ID
+        """
+        pokemon_ids = list(range(1, num_pokemon + 1))
+        names = PokemonTileFactory.fetch_names(pokemon_ids, source)
+        return [PokemonTileFactory._tile_from_name(pokemon_id, names[pokemon_id], rules) for pokemon_id in pokemon_ids]
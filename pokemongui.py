@@ -3,32 +3,68 @@ from tkinter import ttk
 from PIL import Image, ImageTk
 import io
 import requests
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from game import PokeJongGame 
-from player import Player
 from pokemon_tile import PokemonTile
 from game import get_tile_counts
+from sprite_atlas import SpriteAtlas, SpriteIndex, fetch_sprite
+from sprite_config import TILE_WIDTH, TILE_HEIGHT
+from image_cache import ImageCache, DEFAULT_IMAGE_CACHE_BYTES
+from hand_analysis import HandAnalysis, HintWorker
+from engine_worker import GameEngineWorker
+from tile_canvas import TileCanvas
 
 # --- Global UI Constants ---
-TILE_WIDTH, TILE_HEIGHT = 80, 100
+HINT_POLL_MS = 100
+ENGINE_POLL_MS = 50
+ATLAS_POLL_MS = 100
+NAME_POLL_MS = 200
 HIDDEN_TILE_IMAGE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/items/poke-ball.png"
 
 
 class GameUI:
     """Manages the Tkinter Graphical User Interface for PokeJong."""
 
-    def __init__(self, master: tk.Tk, game: PokeJongGame):
+    def __init__(self, master: tk.Tk, game: PokeJongGame, image_cache_bytes: int = DEFAULT_IMAGE_CACHE_BYTES,
+                 sprite_dir: Optional[str] = None):
         self.master = master
         self.game = game
         self.master.title("PokeJong - Pokémon Mahjong")
         
-        self.tile_images = {} 
+        # Decoded tile images, bounded by image_cache_bytes; images on screen stay pinned
+        self.tile_images = ImageCache(max_bytes=image_cache_bytes)
+        self._pinned_images = {}
+        # One packed image for every species in play, built once per game on a background
+        # thread so the window opens at once; tiles show the hidden-tile image until it lands.
+        # With a preprocess_sprites.py directory the sprites are already tile-sized.
+        loader = SpriteIndex(sprite_dir).load if sprite_dir else fetch_sprite
+        self.sprite_atlas: Optional[SpriteAtlas] = None
+        self._atlas_builder = ThreadPoolExecutor(max_workers=1)
+        self._atlas_future = self._atlas_builder.submit(SpriteAtlas.build, self._species_in_play(), TILE_WIDTH,
+                                                        TILE_HEIGHT, loader=loader)
+        self._atlas_builder.shutdown(wait=False)
         self.hidden_tile_image = self._load_image_from_url(HIDDEN_TILE_IMAGE_URL, TILE_WIDTH, TILE_HEIGHT)
         
         self.selected_indices = []
 
+        # Hand analysis runs off the Tk thread; results are polled back in
+        self.hint_worker = HintWorker()
+        self._hint_signature = None
+
+        # Game actions also run off the Tk thread; state deltas are polled back in
+        self.engine = GameEngineWorker(game)
+        self._engine_busy = False
+        self._view: Optional[Dict] = None  # Last state copied from the engine; everything draws from this
+
         self._create_widgets()
         self._update_ui()
+        self.master.after(HINT_POLL_MS, self._poll_hints)
+        self.master.after(ENGINE_POLL_MS, self._poll_engine)
+        self.master.after(ATLAS_POLL_MS, self._poll_atlas)
+        # Tiles dealt with lazy names show placeholders until the resolver delivers
+        if game.name_resolver is not None:
+            self.master.after(NAME_POLL_MS, self._poll_names)
 
     def _load_image_from_url(self, url: str, width: int, height: int) -> Optional[ImageTk.PhotoImage]:
         """Fetches an image from a URL and returns a PhotoImage object."""
@@ -45,18 +81,54 @@ class GameUI:
             placeholder_image = Image.new('RGB', (width, height), color = 'grey')
             return ImageTk.PhotoImage(placeholder_image)
 
+    def _species_in_play(self) -> List[int]:
+        """Returns the ID of every species in the wall, hands, melds and discards."""
+        tiles = list(self.game.draw_pile) + list(self.game.discard_pile)
+        for player in (self.game.player1, self.game.player2):
+            tiles.extend(player.hand)
+            for meld in player.melds:
+                tiles.extend(meld)
+        return sorted({tile.pokemon_id for tile in tiles})
+
     def get_tile_image(self, tile: PokemonTile, is_exposed: bool = True) -> ImageTk.PhotoImage:
         """Returns the appropriate image for a tile, caching the result."""
         if not is_exposed:
             return self.hidden_tile_image
             
-        if tile.pokemon_id not in self.tile_images:
-    
-            url = f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/other/official-artwork/{tile.pokemon_id}.png"
-            
-            self.tile_images[tile.pokemon_id] = self._load_image_from_url(url, TILE_WIDTH, TILE_HEIGHT)
-        
-        return self.tile_images[tile.pokemon_id]
+        return self.tile_images.get_or_load(tile.pokemon_id, lambda: self._load_tile_image(tile.pokemon_id))
+
+    def _load_tile_image(self, pokemon_id: int) -> ImageTk.PhotoImage:
+        """Cuts a tile image from the sprite atlas, or downloads it for species outside the atlas."""
+        if self.sprite_atlas is None:
+            return self.hidden_tile_image  # Still building; _poll_atlas swaps the real images in
+        if pokemon_id in self.sprite_atlas:
+            return self.sprite_atlas.tile_view(pokemon_id, master=self.master)
+        url = f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/other/official-artwork/{pokemon_id}.png"
+        return self._load_image_from_url(url, TILE_WIDTH, TILE_HEIGHT)
+
+    def _acquire_tile_image(self, tile: PokemonTile) -> ImageTk.PhotoImage:
+        """Returns a tile image pinned in the cache until _release_tile_image (used by TileCanvas items)."""
+        return self.tile_images.get_or_load(tile.pokemon_id, lambda: self._load_tile_image(tile.pokemon_id), pin=True)
+
+    def _release_tile_image(self, tile: PokemonTile):
+        """Unpins an image taken with _acquire_tile_image."""
+        self.tile_images.unpin(tile.pokemon_id)
+
+    def _make_tile_canvas(self, parent, on_click=None) -> TileCanvas:
+        """Creates a virtualized tile row whose visible tiles keep their images pinned."""
+        return TileCanvas(parent, TILE_WIDTH, TILE_HEIGHT, self._acquire_tile_image,
+                          release_image=self._release_tile_image, on_click=on_click)
+
+    def _get_pinned_tile_image(self, owner, tile: PokemonTile) -> ImageTk.PhotoImage:
+        """Returns a tile image and pins it in the cache for as long as owner (a frame or dialog) shows it."""
+        image = self.tile_images.get_or_load(tile.pokemon_id, lambda: self._load_tile_image(tile.pokemon_id), pin=True)
+        self._pinned_images.setdefault(owner, []).append(tile.pokemon_id)
+        return image
+
+    def _release_images(self, owner):
+        """Unpins every image owner was showing so the cache may evict them."""
+        for pokemon_id in self._pinned_images.pop(owner, []):
+            self.tile_images.unpin(pokemon_id)
 
     def _create_widgets(self):
         """Sets up the main layout and interactive elements."""
@@ -88,6 +160,8 @@ class GameUI:
         # --- Row 2: Opponent's Hand Display ---
         self.opponent_hand_frame = ttk.LabelFrame(main_frame, text="Opponent's Hand", padding="10")
         self.opponent_hand_frame.grid(row=2, column=0, columnspan=2, pady=10, sticky="ew")
+        self._hand_views = {self.opponent_hand_frame: self._make_tile_canvas(self.opponent_hand_frame)}
+        self._meld_views = {self.opponent_hand_frame: self._make_tile_canvas(self.opponent_hand_frame)}
 
         # --- Row 3: Discard/Wall Area (FIXED GRID ROW) ---
         center_frame = ttk.LabelFrame(main_frame, text="Draw Pile / Discards", padding="10")
@@ -102,191 +176,246 @@ class GameUI:
         button_frame = ttk.Frame(main_frame, padding="10")
         button_frame.grid(row=4, column=0, columnspan=2, pady=10)
         
-        ttk.Button(button_frame, text="Form Meld (Pung)", command=self._handle_meld).grid(row=0, column=0, padx=5)
-        ttk.Button(button_frame, text="Discard Selected", command=self._handle_discard).grid(row=0, column=1, padx=5)
+        self.meld_button = ttk.Button(button_frame, text="Form Meld (Pung)", command=self._handle_meld)
+        self.meld_button.grid(row=0, column=0, padx=5)
+        self.discard_button = ttk.Button(button_frame, text="Discard Selected", command=self._handle_discard)
+        self.discard_button.grid(row=0, column=1, padx=5)
         ttk.Button(button_frame, text="Show Opponent's Discards", command=self._show_opponent_discards).grid(row=0, column=2, padx=5)
         
         # --- Row 5: Current Player Hand Display (FIXED GRID ROW) ---
         self.current_player_hand_frame = ttk.LabelFrame(main_frame, text="Your Hand", padding="10")
         self.current_player_hand_frame.grid(row=5, column=0, columnspan=2, pady=10, sticky="ew")
-    
-    def _draw_hand(self, player: Player, target_frame : ttk.LabelFrame, is_current_player: bool):
-        """Draws a player's hand, fully visible for testing purposes."""
-        # 1. Clear the frame
-        for widget in target_frame.winfo_children():
-            widget.destroy()
-
-        hand = player.hand
+        # Only the current player's tiles are interactive for discard/meld
+        self._hand_views[self.current_player_hand_frame] = self._make_tile_canvas(
+            self.current_player_hand_frame, on_click=self._toggle_selection)
+        self._meld_views[self.current_player_hand_frame] = self._make_tile_canvas(self.current_player_hand_frame)
+
+        # --- Row 6: Hint Panel ---
+        hint_frame = ttk.LabelFrame(main_frame, text="Hints", padding="10")
+        hint_frame.grid(row=6, column=0, columnspan=2, pady=5, sticky="ew")
+        self.hint_label = ttk.Label(hint_frame, text="Analyzing hand...")
+        self.hint_label.pack(anchor="w")
+
+    def _draw_hand(self, seat: Dict, target_frame : ttk.LabelFrame, is_current_player: bool):
+        """Draws a player's hand and melds (a seat from the engine view), fully visible for testing purposes."""
+        hand = seat['hand']
         # Update label text to clearly show whose hand it is
         turn_status = "ACTIVE TURN ➡️" if is_current_player else "Opponent"
-        target_frame.config(text=f"{player.name}'s Hand ({len(hand)} Tiles) - {turn_status}")
+        target_frame.config(text=f"{seat['name']}'s Hand ({len(hand)} Tiles) - {turn_status}")
 
         # Reset selection if it's the current player's frame
         if is_current_player:
             self.selected_indices = []
 
-        # 2. Draw the tiles
-        for i, tile in enumerate(hand):
-            # FIX: Always set is_exposed = True for testing without masking
-            is_exposed = True 
-            image = self.get_tile_image(tile, is_exposed=is_exposed)
-
-            tile_label = ttk.Label(target_frame, image=image, relief="raised", borderwidth=1)
-            tile_label.grid(row=0, column=i, padx=2)
-
-            # Only the current player's tiles should be interactive for discard/meld
-            if is_current_player:
-                tile_label.bind("<Button-1>", lambda event, index=i, label=tile_label: self._toggle_selection(index, label))
-
-        # 3. Draw Melds (placed below the tiles)
-        meld_text_parts = []
-        for meld in player.melds:
-            meld_names = ", ".join(t.name for t in meld)
-            meld_text_parts.append(f"({meld_names})")
-
-        meld_text = "Melds: " + " | ".join(meld_text_parts)
-
-        # Place the meld display label
-        # Use a large columnspan to prevent cutoff
-        ttk.Label(target_frame, text=meld_text).grid(row=1, column=0, columnspan=len(hand) + 5, pady=5)
-
-    def _update_ui(self):
-        """Refreshes all UI elements based on the current game state."""
-        current_player = self.game.current_player
-        opponent = self.game.other_player
+        # FIX: Always exposed for testing without masking
+        self._hand_views[target_frame].set_tiles(hand)
+        # Melds go in a second row, one group per meld
+        self._meld_views[target_frame].set_groups(seat['melds'], empty_text="Melds: None")
+
+    def _update_ui(self, view: Optional[Dict] = None):
+        """Refreshes all UI elements from an engine view (by default, a fresh copy of the game state)."""
+        # The copy is taken under the engine lock; drawing (and any image loading) happens after it is released
+        self._view = view if view is not None else self.engine.view()
+        self._render(self._view)
+
+    def _render(self, view: Dict):
+        """Redraws every widget from an engine view; never touches the live game."""
+        player1, player2 = view['players']
+        current_player = view['players'][view['current']]
+        opponent = view['players'][1 - view['current']]
         
         # 1. Update Status Label
-        status_text = f"Tiles Left: {len(self.game.draw_pile)}"
-        if self.game.game_over:
-             status_text = f"GAME OVER! Winner: {self.game.winner.name if self.game.winner else 'None'}"
+        status_text = f"Tiles Left: {view['wall_size']}"
+        if view['game_over']:
+             status_text = f"GAME OVER! Winner: {view['winner'] or 'None'}"
         self.status_label.config(text=status_text)
 
         # 2. Update Draw/Discard Area
-        player1 = self.game.player1
-        player2 = self.game.player2
-
-        self.ash_frame.config(borderwidth=2, relief="groove", text=self.game.player1.name)
-        self.joy_frame.config(borderwidth=2, relief="groove", text=self.game.player1.name)
+        self.ash_frame.config(borderwidth=2, relief="groove", text=player1['name'])
+        self.joy_frame.config(borderwidth=2, relief="groove", text=player1['name'])
         
-        self.ash_score_label.config(text=f"Score: {player1.score}")
-        self.joy_score_label.config(text=f"Score: {player2.score}")
+        self.ash_score_label.config(text=f"Score: {player1['score']}")
+        self.joy_score_label.config(text=f"Score: {player2['score']}")
 
         # Apply highlight to the current player
-        if current_player == player1:
-            self.ash_frame.config(relief="solid", borderwidth=4, text=f"{player1.name} (YOUR TURN ➡️)")
+        if view['current'] == 0:
+            self.ash_frame.config(relief="solid", borderwidth=4, text=f"{player1['name']} (YOUR TURN ➡️)")
         else:
-            self.joy_frame.config(relief="solid", borderwidth=4, text=f"{player2.name} (YOUR TURN ➡️)")
+            self.joy_frame.config(relief="solid", borderwidth=4, text=f"{player2['name']} (YOUR TURN ➡️)")
 
         # 3. Redraw Player Hand -> Clear old tiles and reset selections
         self._draw_hand(opponent, self.opponent_hand_frame, is_current_player=False)
         self._draw_hand(current_player, self.current_player_hand_frame, is_current_player=True)
         
         # 4. Update Draw/Discard Area
-        self.wall_label.config(text=f"Wall: {len(self.game.draw_pile)} tiles")
-        last_discard = self.game.discard_pile[-1] if self.game.discard_pile else "None"
-        self.discard_label.config(text=f"Last Discard: {last_discard}")
+        self.wall_label.config(text=f"Wall: {view['wall_size']} tiles")
+        self.discard_label.config(text=f"Last Discard: {view['last_discard'] or 'None'}")
+
+        # 5. Ask for hints on the new hand (answered from cache or by the worker)
+        self._request_hints()
+
+    def _request_hints(self):
+        """Requests analysis of the current player's hand; stale requests are dropped by the worker."""
+        self._hint_signature = self._view['hint_signature']
+        analysis = self.hint_worker.request(self._hint_signature)
+        if analysis is not None:
+            self._show_hints(analysis)
+        else:
+            self.hint_label.config(text="Analyzing hand...")
+
+    def _poll_hints(self):
+        """Applies finished hint results that still match the hand on screen."""
+        for signature, analysis in self.hint_worker.poll():
+            if signature == self._hint_signature:
+                self._show_hints(analysis)
+        self.master.after(HINT_POLL_MS, self._poll_hints)
+
+    def _show_hints(self, analysis: HandAnalysis):
+        """Renders a hand analysis in the hint panel."""
+        # Names come from the hand copied under the engine lock, not the live game
+        hand = self._view['players'][self._view['current']]['hand']
+        names = {tile.pokemon_id: tile.name for tile in hand}
+        if analysis.distance is None:
+            self.hint_label.config(text="This hand can no longer form 4 Pungs + 1 Pair.")
+            return
+        if analysis.distance == 0:
+            self.hint_label.config(text="Winning hand!")
+            return
+        waits = ", ".join(names.get(pokemon_id, f"#{pokemon_id}") for pokemon_id in analysis.waits) or "None yet"
+        text = f"Tiles needed: {analysis.distance} | Winning tiles: {waits}"
+        if analysis.best_discard is not None:
+            text += f" | Suggested discard: {names.get(analysis.best_discard, f'#{analysis.best_discard}')}"
+        self.hint_label.config(text=text)
 
 
-    def _toggle_selection(self, index: int, label: ttk.Label):
+    def _toggle_selection(self, index: int):
         """Handles tile selection for meld/discard actions."""
         if index in self.selected_indices:
             self.selected_indices.remove(index)
-            label.config(relief="raised")
-        else:
-            if len(self.selected_indices) < 3: # Max 3 for Pung
-                self.selected_indices.append(index)
-                label.config(relief="sunken")
+        elif len(self.selected_indices) < 3: # Max 3 for Pung
+            self.selected_indices.append(index)
+        self._hand_views[self.current_player_hand_frame].set_selected(self.selected_indices)
 
     def _handle_meld(self):
-        """Attempts to form a meld with selected tiles."""
+        """Asks the engine to form a meld with the selected tiles."""
+        if self._engine_busy:
+            return
         if len(self.selected_indices) != 3:
             print("Select exactly 3 tiles for a Pung/Kong.")
             return
 
-        # Call the game logic
-        if self.game.form_meld(self.selected_indices):
-            print("Meld formed successfully! Checking for win...")
-            if self.game.check_win_condition():
-                self._game_over_ui()
-                return
-
-            self._update_ui()
-        else:
-            print("Meld failed: Tiles must match.")
-        
-        self.selected_indices = []
-        self._draw_hand(self.game.current_player, self.current_player_hand_frame, is_current_player=True)
+        self._submit('meld', list(self.selected_indices))
 
     def _handle_discard(self):
-        """Discards the single selected tile and switches turn."""
+        """Asks the engine to discard the single selected tile and play out the turn."""
+        if self._engine_busy:
+            return
         if len(self.selected_indices) != 1:
             print("Select exactly 1 tile to discard.")
             return
             
-        discard_index = self.selected_indices[0]
-        
-        # Call the game logic for discard
-        if self.game.discard_tile(discard_index):
-            
-            # Opponent Check (Ron/Pung/Kong) happens here
-            discarded_tile = self.game.discard_pile[-1]
-            action_taken = self.game.check_opponent_action(discarded_tile)
-            
-            if not action_taken:
-                self.game.switch_turn()
-            
-            # Force the next player to draw when they start their turn
-            self.game.draw_tile() 
-            
-            self._update_ui() # Refresh the UI for the new player/state
-        else:
-            print("Discard failed.")
+        self._submit('discard', self.selected_indices[0])
+
+    def _submit(self, command: str, argument):
+        """Sends a command to the engine thread and blocks input until its update arrives."""
+        self._engine_busy = True
+        self.meld_button.state(["disabled"])
+        self.discard_button.state(["disabled"])
+        self.status_label.config(text="Playing turn...")
+        self.engine.submit(command, argument)
+
+    def _poll_engine(self):
+        """Applies state updates posted by the engine thread."""
+        for update in self.engine.poll():
+            self._engine_busy = False
+            self.meld_button.state(["!disabled"])
+            self.discard_button.state(["!disabled"])
+
+            if update['error']:
+                print(f"Engine error: {update['error']}")
+            elif not update['ok']:
+                print("Meld failed: Tiles must match." if update['command'] == 'meld' else "Discard failed.")
+            elif update['command'] == 'meld':
+                print("Meld formed successfully! Checking for win...")
+
+            # An empty delta (e.g. a rejected meld) leaves the screen, and the selection, as they were
+            if update['delta']:
+                self._update_ui(update['view'])
+            if update['delta'].get('game_over'):
+                self._game_over_ui()
+        self.master.after(ENGINE_POLL_MS, self._poll_engine)
+
+    def _poll_atlas(self):
+        """Swaps the finished sprite atlas in for the placeholder tile images."""
+        if not self._atlas_future.done():
+            self.master.after(ATLAS_POLL_MS, self._poll_atlas)
+            return
+        self.sprite_atlas = self._atlas_future.result()
+        # Cached entries are all placeholders; redrawing reloads them from the atlas
+        self.tile_images.clear()
+        if not self._engine_busy:
+            self._update_ui()
+
+    def _poll_names(self):
+        """Refreshes the text that shows tile names as species names arrive."""
+        # While the engine is mid-turn, leave the names queued for the next poll
+        if self._engine_busy:
+            self.master.after(NAME_POLL_MS, self._poll_names)
+            return
+        finished = self.game.name_resolver.wait(0)
+        if self.game.name_resolver.poll():
+            # Tile images are keyed by ID, so only labels and hints need redrawing;
+            # the view holds the same tile objects, which now report their names
+            self.discard_label.config(text=f"Last Discard: {self._view['last_discard'] or 'None'}")
+            self._request_hints()
+        if not finished:
+            self.master.after(NAME_POLL_MS, self._poll_names)
 
     def _show_opponent_discards(self):
         """Creates a simple window to display the opponent's discarded tiles."""
-        opponent = self.game.other_player
+        if self._engine_busy:
+            return  # The engine is mid-turn; the piles are about to change
+        view = self._view
+        opponent = view['players'][1 - view['current']]
 
         # 1. Create the top-level dialog window
         dialog = tk.Toplevel(self.master)
-        dialog.title(f"{opponent.name}'s Discard and Exposed Tiles")
+        dialog.title(f"{opponent['name']}'s Discard and Exposed Tiles")
 
         main_frame = ttk.Frame(dialog, padding="10")
         main_frame.pack(fill='both', expand=True)
 
         # 2. Display Discards
-        ttk.Label(main_frame, text=f"--- {opponent.name}'s Discard Pile ---", font=('Arial', 12, 'bold')).pack(pady=5)
+        ttk.Label(main_frame, text=f"--- {opponent['name']}'s Discard Pile ---", font=('Arial', 12, 'bold')).pack(pady=5)
 
-        discard_frame = ttk.Frame(main_frame)
-        discard_frame.pack(pady=5)
-
-        if not opponent.discards:
-            ttk.Label(discard_frame, text="No tiles discarded yet.").pack()
-        else:
-            # Display the discarded tiles visually
-            for i, tile in enumerate(opponent.discards):
-                image = self.get_tile_image(tile, is_exposed=True)
-                tile_label = ttk.Label(discard_frame, image=image, relief="flat", borderwidth=0)
-                tile_label.grid(row=0, column=i, padx=1)
-                self.tile_images[f'discard_opp_{i}'] = image 
+        discard_holder = ttk.Frame(main_frame)
+        discard_holder.pack(pady=5, fill='x')
+        self._make_tile_canvas(discard_holder).set_tiles(opponent['discards'], empty_text="No tiles discarded yet.")
 
         # 3. Display Exposed Melds
-        meld_display_text = f"\n--- Exposed Melds --- \n{opponent.show_melds()}"
-        ttk.Label(main_frame, text=meld_display_text).pack(pady=10)
+        ttk.Label(main_frame, text="--- Exposed Melds ---").pack(pady=(10, 0))
+        meld_holder = ttk.Frame(main_frame)
+        meld_holder.pack(pady=5, fill='x')
+        self._make_tile_canvas(meld_holder).set_groups(opponent['melds'], empty_text="None")
 
-        if self.game.discard_pile:
+        if view['last_discard'] is not None:
             ttk.Label(main_frame, text=f"---Last Discarded Tile---").pack(pady=5)
-            central_discard = self.game.discard_pile[-1]
-            image = self.get_tile_image(central_discard, is_exposed = True)
+            central_discard = view['last_discard']
+            image = self._get_pinned_tile_image(dialog, central_discard)
             ttk.Label(main_frame, image=image, relief="flat", borderwidth=0).pack()
-            self.tile_images["central_discard_ref"] = image
+
+        # Release the dialog's images once it closes
+        dialog.bind("<Destroy>", lambda event: self._release_images(dialog) if event.widget is dialog else None)
 
         # Close button
         ttk.Button(main_frame, text="Close", command=dialog.destroy).pack(pady=10)
 
     def _game_over_ui(self):
         """Displays game over message."""
-        self.status_label.config(text=f"GAME OVER! {self.game.winner.name if self.game.winner else 'TIE'} WINS!")
-        # Disable buttons, show final scores, etc.
+        self.status_label.config(text=f"GAME OVER! {self._view['winner'] or 'TIE'} WINS!")
+        self.meld_button.state(["disabled"])
+        self.discard_button.state(["disabled"])
+        # Show final scores, etc.
         # ... (further UI cleanup for end state) ...
 
 def start_gui():
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Offline sprite preprocessing for PokeJong.
+Fetches official artwork once (or reads it from a local directory), resizes it
+across all CPU cores to one or more tile scales, and writes an indexed output
+directory that GameUI loads without resampling at runtime.
+
+Examples:
+    python preprocess_sprites.py --start 1 --end 151 --out sprites
+    python preprocess_sprites.py --source-dir raw_art --out sprites --scales 1 2 3
+"""
+
+import argparse
+import io
+import json
+import os
+import requests
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from sprite_config import SPRITE_URL, SPRITE_INDEX_FILE, TILE_WIDTH, TILE_HEIGHT
+
+
+def _download(pokemon_id: int) -> Tuple[int, Optional[bytes]]:
+    """Download one species' full-size artwork."""
+    try:
+        response = requests.get(SPRITE_URL.format(pokemon_id=pokemon_id), timeout=10)
+        response.raise_for_status()
+        return pokemon_id, response.content
+    except requests.RequestException as e:
+        print(f"Error downloading sprite for Pokemon {pokemon_id}: {e}")
+        return pokemon_id, None
+
+
+def _resize(job: Tuple[int, bytes, str, List[int], int, int]) -> Tuple[int, Optional[Dict[str, str]]]:
+    """Resize one sprite to every scale and save it; runs in a worker process. Returns None files for a bad image."""
+    pokemon_id, data, out_dir, scales, width, height = job
+    try:
+        image = Image.open(io.BytesIO(data)).convert('RGBA')
+        files = {}
+        for scale in scales:
+            relative = os.path.join(f"{scale}x", f"{pokemon_id}.png")
+            image.resize((width * scale, height * scale), Image.Resampling.LANCZOS).save(os.path.join(out_dir, relative))
+            files[str(scale)] = relative
+        return pokemon_id, files
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        # OSError covers PIL's UnidentifiedImageError and truncated files; skip just this sprite
+        print(f"Error resizing sprite for Pokemon {pokemon_id}: {e}")
+        return pokemon_id, None
+
+
+def _read_source_dir(source_dir: str) -> Dict[int, bytes]:
+    """Read '<id>.png' files from a local directory."""
+    sprites = {}
+    for filename in os.listdir(source_dir):
+        stem, extension = os.path.splitext(filename)
+        if extension.lower() == '.png' and stem.isdigit():
+            with open(os.path.join(source_dir, filename), 'rb') as f:
+                sprites[int(stem)] = f.read()
+    return sprites
+
+
+def preprocess_sprites(out_dir: str, pokemon_ids: Optional[List[int]] = None, source_dir: Optional[str] = None,
+                       scales: Tuple[int, ...] = (1, 2), width: int = TILE_WIDTH, height: int = TILE_HEIGHT,
+                       workers: Optional[int] = None) -> Dict:
+    """
+    Build a preprocessed sprite directory.
+    
+    Args:
+        out_dir: Output directory (created if needed)
+        pokemon_ids: Species to download (ignored when source_dir is given)
+        source_dir: Directory of full-size '<id>.png' files to use instead of downloading
+        scales: Integer multiples of the tile size to produce
+        width: 1x tile width
+        height: 1x tile height
+        workers: Resize processes (default: CPU count)
+        
+    Returns:
+        The index written to out_dir/index.json
+    """
+    if source_dir:
+        sprites = _read_source_dir(source_dir)
+    else:
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            sprites = {pokemon_id: data for pokemon_id, data in executor.map(_download, pokemon_ids or []) if data}
+
+    for scale in scales:
+        os.makedirs(os.path.join(out_dir, f"{scale}x"), exist_ok=True)
+
+    jobs = [(pokemon_id, data, out_dir, list(scales), width, height) for pokemon_id, data in sorted(sprites.items())]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_resize, jobs, chunksize=max(1, len(jobs) // (4 * (os.cpu_count() or 1))))
+        files = {pokemon_id: sprite_files for pokemon_id, sprite_files in results if sprite_files is not None}
+
+    index = {
+        'tile_width': width,
+        'tile_height': height,
+        'scales': list(scales),
+        'sprites': {str(pokemon_id): files[pokemon_id] for pokemon_id in sorted(files)},
+    }
+    with open(os.path.join(out_dir, SPRITE_INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    return index
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Pre-resize PokeJong tile sprites into an indexed directory.")
+    parser.add_argument('--out', required=True, help="Output directory")
+    parser.add_argument('--start', type=int, default=1, help="First Pokemon ID to download")
+    parser.add_argument('--end', type=int, default=151, help="Last Pokemon ID to download (inclusive)")
+    parser.add_argument('--source-dir', help="Read full-size '<id>.png' files from here instead of downloading")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 2], help="Tile size multiples to produce")
+    parser.add_argument('--workers', type=int, help="Resize processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    index = preprocess_sprites(args.out, list(range(args.start, args.end + 1)), args.source_dir,
+                               tuple(args.scales), workers=args.workers)
+    print(f"Wrote {len(index['sprites'])} sprites at scales {index['scales']} to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Reinforcement learning environment for PokeJong.
+Gym-style reset/step over fixed-shape NumPy observations, implemented directly
+on per-species count arrays so many games can be stepped in one call.
+
+The agent always acts for the player whose turn it is (self-play); observations
+and rewards are from that player's point of view. An action is the index of the
+species to discard (pokemon_id - 1). The rules follow PokeJongGame: Ron on the
+opponent's discard, automatic Pung/Kong calls, Tsumo after a draw, and the
+higher score wins when the wall runs out.
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from game import PokeJongGame
+from hand_eval import bonus_points, species_points, winning_mask
+from scoring_rules import ScoringRules, default_rules
+
+HAND_SIZE = 13
+NUM_COPIES = 4
+
+
+class PokeJongVecEnv:
+    """Steps num_envs independent PokeJong games with one batch of array operations.
+    
+    Observations are a dict of arrays with a leading num_envs axis:
+        own_counts      (B, N)     tiles of each species in the acting player's hand
+        visible_counts  (B, N)     tiles visible to everyone (discard pile + all melds)
+        melds           (B, 2, N)  meld tile counts, acting player first
+        wall_size       (B,)       tiles left in the draw pile
+        action_mask     (B, N)     True where the species can be discarded
+    Finished games are reset automatically; the observation returned for them is
+    the first position of the next game.
+    """
+
+    def __init__(self, num_envs: int, num_pokemon: int = 20, seed: Optional[int] = None,
+                 rules: Optional[ScoringRules] = None, auto_reset: bool = True):
+        """
+        Initialize the environments (call reset() before stepping).
+        
+        Args:
+            num_envs: Number of games stepped together
+            num_pokemon: Number of species in each tile set
+            seed: Seed for the wall shuffles
+            rules: Tile points, win bonuses and multipliers (default: default_rules(), as PokeJongGame)
+            auto_reset: Reset finished games inside step()
+        """
+        self.num_envs = num_envs
+        self.num_pokemon = num_pokemon
+        self.num_actions = num_pokemon
+        self.wall_length = num_pokemon * NUM_COPIES
+        self.rules = rules or default_rules()
+        self.auto_reset = auto_reset
+        self.points = species_points(num_pokemon, self.rules)
+        self.rng = np.random.default_rng(seed)
+        self._rows = np.arange(num_envs)
+
+        shape = (num_envs, 2, num_pokemon)
+        self.hands = np.zeros(shape, dtype=np.int16)
+        self.melds = np.zeros(shape, dtype=np.int16)
+        self.num_melds = np.zeros((num_envs, 2), dtype=np.int16)
+        self.discard_counts = np.zeros((num_envs, num_pokemon), dtype=np.int16)
+        self.walls = np.zeros((num_envs, self.wall_length), dtype=np.int16)
+        self.wall_top = np.zeros(num_envs, dtype=np.int64)
+        self.current = np.zeros(num_envs, dtype=np.int64)
+        self.scores = np.zeros((num_envs, 2), dtype=np.int64)
+        self.turns = np.zeros(num_envs, dtype=np.int64)
+        self.done = np.zeros(num_envs, dtype=bool)
+
+    def _reset_rows(self, rows: np.ndarray):
+        """Deal fresh games into the given environment rows."""
+        if rows.size == 0:
+            return
+        base = np.repeat(np.arange(self.num_pokemon, dtype=np.int16), NUM_COPIES)
+        self.walls[rows] = self.rng.permuted(np.tile(base, (rows.size, 1)), axis=1)
+        for array in (self.hands, self.melds, self.num_melds, self.discard_counts, self.scores):
+            array[rows] = 0
+        self.current[rows] = 0
+        self.turns[rows] = 0
+        self.done[rows] = False
+
+        # Deal like PokeJongGame.deal: alternate tiles from the top, player 1 first
+        dealt = self.walls[rows, -2 * HAND_SIZE:][:, ::-1]
+        for seat in (0, 1):
+            seat_tiles = dealt[:, seat::2]
+            np.add.at(self.hands, (np.repeat(rows, HAND_SIZE), seat, seat_tiles.ravel()), 1)
+        self.wall_top[rows] = self.wall_length - 2 * HAND_SIZE
+
+        # The dealer draws the first tile (and very rarely wins on it)
+        done = np.zeros(self.num_envs, dtype=bool)
+        self._draw(rows, done, np.full(self.num_envs, -1, dtype=np.int64))
+        self.done[rows] = done[rows]
+
+    def reset(self, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Start new games in every environment and return the first observations."""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_rows(self._rows)
+        return self._observe()
+
+    def _win_score(self, rows: np.ndarray, seats: np.ndarray, tiles: np.ndarray, win_type: str) -> np.ndarray:
+        """Score a win like PokeJongGame.calculate_win_score (hand + melds + winning tile, bonuses, multiplier)."""
+        hands = self.hands[rows, seats].astype(np.int64)
+        melds = self.melds[rows, seats].astype(np.int64)
+        base = (hands * self.points).sum(axis=1) + (melds * self.points).sum(axis=1) + self.points[tiles]
+        is_ron = np.full(rows.size, win_type == 'Ron')
+        counts = hands + melds
+        if win_type == 'Ron':
+            counts[np.arange(rows.size), tiles] += 1  # The claimed tile is not in hand yet
+        bonus = bonus_points(self.rules, counts, melds, self.num_melds[rows, seats], is_ron, self.points)
+        return np.floor((base + bonus) * self.rules.multipliers[win_type]).astype(np.int64)
+
+    def _draw(self, rows: np.ndarray, done: np.ndarray, winner: np.ndarray):
+        """
+        Current player draws in rows, handling an empty wall and Tsumo.
+        
+        Args:
+            rows: Environment rows that draw
+            done: (num_envs,) flags, set for games that end
+            winner: (num_envs,) winning seat, set for Tsumo wins
+        """
+        empty = self.wall_top[rows] == 0
+        done[rows[empty]] = True
+
+        drawing = rows[~empty]
+        if drawing.size:
+            self.wall_top[drawing] -= 1
+            tiles = self.walls[drawing, self.wall_top[drawing]]
+            seats = self.current[drawing]
+            self.hands[drawing, seats, tiles] += 1
+
+            tsumo = winning_mask(self.hands[drawing, seats] + self.melds[drawing, seats])
+            if tsumo.any():
+                win_rows, win_seats = drawing[tsumo], seats[tsumo]
+                self.scores[win_rows, win_seats] += self._win_score(win_rows, win_seats, tiles[tsumo], 'Tsumo')
+                done[win_rows] = True
+                winner[win_rows] = win_seats
+
+    def _observe(self) -> Dict[str, np.ndarray]:
+        """Build observations from each acting player's point of view."""
+        me = self.current
+        opponent = 1 - me
+        own = self.hands[self._rows, me]
+        return {
+            'own_counts': own.copy(),
+            'visible_counts': self.discard_counts + self.melds.sum(axis=1),
+            'melds': np.stack([self.melds[self._rows, me], self.melds[self._rows, opponent]], axis=1),
+            'wall_size': self.wall_top.copy(),
+            'action_mask': own > 0,
+        }
+
+    def step(self, actions: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Discard one tile in every environment.
+        
+        Args:
+            actions: (B,) species indices to discard; must be allowed by action_mask
+            
+        Returns:
+            (observations, rewards, dones, info) where rewards are the acting
+            player's score change minus the opponent's, and info holds each
+            finished game's 'winner' (0, 1 or -1 for a tie) and final 'scores'
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        rows = self._rows
+        me = self.current.copy()
+        opponent = 1 - me
+        if not (self.hands[rows, me, actions] > 0).all():
+            raise ValueError("Action discards a tile that is not in hand")
+
+        before = self.scores.copy()
+        done = np.zeros(self.num_envs, dtype=bool)
+        winner = np.full(self.num_envs, -1, dtype=np.int64)
+
+        # Discard
+        self.hands[rows, me, actions] -= 1
+        self.discard_counts[rows, actions] += 1
+        self.turns += 1
+
+        # Ron: the opponent wins on the discard
+        totals = self.hands[rows, opponent] + self.melds[rows, opponent]
+        totals[rows, actions] += 1
+        ron = winning_mask(totals)
+        if ron.any():
+            # The claimed tile is scored separately, as in calculate_win_score
+            self.scores[rows[ron], opponent[ron]] += self._win_score(rows[ron], opponent[ron], actions[ron], 'Ron')
+            done[ron] = True
+            winner[ron] = opponent[ron]
+
+        # Pung/Kong calls on the discard (2 or 3 matching tiles in the opponent's hand)
+        matching = self.hands[rows, opponent, actions]
+        claim = ~ron & (matching >= 2)
+        if claim.any():
+            c_rows, c_seats, c_tiles, c_count = rows[claim], opponent[claim], actions[claim], matching[claim]
+            self.hands[c_rows, c_seats, c_tiles] -= c_count
+            self.melds[c_rows, c_seats, c_tiles] += c_count + 1
+            self.num_melds[c_rows, c_seats] += 1
+            self.discard_counts[c_rows, c_tiles] -= 1
+            meld_points = (c_count + 1) * self.points[c_tiles]
+            self.scores[c_rows, c_seats] += np.where(c_count == 3, meld_points * 2, meld_points)
+
+        # Every game not won passes the turn; games without a call also draw
+        self.current[~ron] = opponent[~ron]
+        self._draw(rows[~ron & ~claim], done, winner)
+
+        # Kong calls draw no replacement tile, so a hand can run dry; end that game
+        done |= self.hands[rows, self.current].sum(axis=1) == 0
+
+        # Games ending without a win go to the higher score (check_draw_condition)
+        no_win = done & (winner == -1)
+        winner[no_win] = np.where(self.scores[no_win, 0] > self.scores[no_win, 1], 0,
+                                  np.where(self.scores[no_win, 1] > self.scores[no_win, 0], 1, -1))
+
+        gained = self.scores - before
+        rewards = (gained[rows, me] - gained[rows, opponent]).astype(np.float32)
+        info = {'winner': winner, 'scores': self.scores.copy(), 'turns': self.turns.copy()}
+
+        self.done = done.copy()
+        if self.auto_reset:
+            self._reset_rows(rows[done])
+        return self._observe(), rewards, done, info
+
+
+class PokeJongEnv:
+    """Single-game wrapper around PokeJongVecEnv with unbatched observations."""
+
+    def __init__(self, num_pokemon: int = 20, seed: Optional[int] = None, rules: Optional[ScoringRules] = None):
+        self._env = PokeJongVecEnv(1, num_pokemon, seed, rules=rules or PokeJongGame().scoring, auto_reset=False)
+        self.num_actions = self._env.num_actions
+
+    def reset(self, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Start a new game and return the first observation."""
+        return {key: value[0] for key, value in self._env.reset(seed).items()}
+
+    def step(self, action: int) -> Tuple[Dict[str, np.ndarray], float, bool, Dict]:
+        """Discard one tile; returns (observation, reward, done, info)."""
+        if self._env.done[0]:
+            raise RuntimeError("Game is over; call reset()")
+        obs, rewards, dones, info = self._env.step(np.array([action]))
+        return ({key: value[0] for key, value in obs.items()}, float(rewards[0]), bool(dones[0]),
+                {key: value[0] for key, value in info.items()})
+
+
+def _random_actions(rng: np.random.Generator, mask: np.ndarray) -> np.ndarray:
+    """Pick a uniformly random legal action per row (rows without legal actions get 0)."""
+    scores = rng.random(mask.shape) * mask
+    return scores.argmax(axis=1)
+
+
+def benchmark(num_envs: int = 1024, num_steps: int = 200, num_games: int = 200):
+    """Compare vectorized stepping with the object-based game loop."""
+    import contextlib
+    import os
+    import random
+    from tournament import play_game, random_discard
+    from pokemon_tile import PokemonTileFactory
+    from tile_source import StubSource
+
+    env = PokeJongVecEnv(num_envs, seed=0)
+    obs = env.reset()
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        obs, rewards, dones, info = env.step(_random_actions(rng, obs['action_mask']))
+    vec_rate = num_envs * num_steps / (time.perf_counter() - start)
+
+    species = [PokemonTileFactory.create_tile(i, StubSource()) for i in range(1, 21)]
+    turns = 0
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for seed in range(num_games):
+            turns += play_game([random_discard, random_discard], species, seed)['turns']
+    loop_rate = turns / (time.perf_counter() - start)
+
+    print(f"PokeJongVecEnv ({num_envs} envs): {vec_rate:12,.0f} steps/s")
+    print(f"PokeJongGame loop:           {loop_rate:12,.0f} turns/s")
+    print(f"Speed-up:                    {vec_rate / loop_rate:12.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
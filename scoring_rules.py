@@ -0,0 +1,135 @@
+"""
+Scoring rules module for PokeJong.
+Loads tile point tables, win bonuses and win type multipliers from a JSON
+config (scoring_rules.json by default) and compiles each bonus into a small
+predicate over a HandSummary, so scoring a win is a handful of comparisons.
+
+Bonus conditions ("when"), all of which must hold:
+    melds       exact number of melds
+    min_melds   at least this many melds
+    min_kongs   at least this many 4-tile melds
+    max_species at most this many different species in the winning hand
+    min_points  every tile in the winning hand is worth at least this much
+    win_type    "Tsumo" or "Ron"
+"""
+
+import bisect
+import json
+import os
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_rules.json")
+
+
+class HandSummary(NamedTuple):
+    """What the scoring rules look at for a win; built from a player's running totals."""
+    hand_points: int  # Points of the tiles in hand
+    meld_points: int  # Points of the tiles in melds
+    winning_points: int  # Points of the winning tile
+    counts: Counter  # pokemon_id -> tiles across hand, melds and the winning tile
+    meld_sizes: Tuple[int, ...]
+    win_type: str
+
+
+Check = Callable[[HandSummary], bool]
+
+
+def _compile_condition(name: str, value, points_for: Callable[[int], int]) -> Check:
+    """Turn one "when" entry into a predicate."""
+    if name == 'melds':
+        return lambda summary: len(summary.meld_sizes) == value
+    if name == 'min_melds':
+        return lambda summary: len(summary.meld_sizes) >= value
+    if name == 'min_kongs':
+        return lambda summary: sum(1 for size in summary.meld_sizes if size == 4) >= value
+    if name == 'max_species':
+        return lambda summary: len(summary.counts) <= value
+    if name == 'min_points':
+        return lambda summary: all(points_for(pokemon_id) >= value for pokemon_id in summary.counts)
+    if name == 'win_type':
+        return lambda summary: summary.win_type == value
+    raise ValueError(f"Unknown scoring condition: {name}")
+
+
+class ScoringRules:
+    """Compiled scoring rules."""
+
+    def __init__(self, config: Dict):
+        """
+        Compile a rules config.
+
+        Args:
+            config: Dictionary with 'tile_points', 'bonuses' and 'multipliers'
+                (the layout of scoring_rules.json)
+
+        Raises:
+            ValueError: If a bonus uses an unknown condition
+        """
+        self.config = config
+        tile_points = config.get('tile_points', {})
+        ranges = sorted(tile_points.get('ranges', []), key=lambda entry: entry['max_id'])
+        self._range_bounds = [entry['max_id'] for entry in ranges]
+        self._range_points = [entry['points'] for entry in ranges]
+        self._default_points = tile_points.get('default', 10)
+        self._species_points = {int(pokemon_id): points for pokemon_id, points in tile_points.get('species', {}).items()}
+
+        self.bonuses: List[Tuple[str, int, List[Check]]] = []
+        for bonus in config.get('bonuses', []):
+            checks = [_compile_condition(name, value, self.points_for) for name, value in bonus.get('when', {}).items()]
+            self.bonuses.append((bonus['name'], bonus['points'], checks))
+
+        self.multipliers: Dict[str, float] = dict(config.get('multipliers', {'Tsumo': 2, 'Ron': 1.5}))
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ScoringRules':
+        """Load and compile rules from a JSON file."""
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def with_multiplier(self, win_type: str, multiplier: float) -> 'ScoringRules':
+        """Returns a copy of these rules with one win type multiplier changed."""
+        return ScoringRules(dict(self.config, multipliers=dict(self.multipliers, **{win_type: multiplier})))
+
+    def __reduce__(self):
+        # The compiled checks are closures; pickle (e.g. for worker processes) by recompiling the config
+        return ScoringRules, (self.config,)
+
+    def points_for(self, pokemon_id: int) -> int:
+        """Point value of a species: per-species override, then the first ID range containing it."""
+        if pokemon_id in self._species_points:
+            return self._species_points[pokemon_id]
+        index = bisect.bisect_left(self._range_bounds, pokemon_id)
+        if index < len(self._range_points):
+            return self._range_points[index]
+        return self._default_points
+
+    def score(self, summary: HandSummary) -> Dict:
+        """
+        Score a win.
+
+        Args:
+            summary: The winning hand
+
+        Returns:
+            Dictionary with 'base_points', 'bonus', 'bonuses' ((name, points) of each
+            bonus awarded), 'multiplier' and 'final_score'
+        """
+        base_points = summary.hand_points + summary.meld_points + summary.winning_points
+        awarded = [(name, points) for name, points, checks in self.bonuses if all(check(summary) for check in checks)]
+        bonus = sum(points for _, points in awarded)
+        multiplier = self.multipliers[summary.win_type]
+        return {
+            'base_points': base_points,
+            'bonus': bonus,
+            'bonuses': awarded,
+            'multiplier': multiplier,
+            'final_score': int((base_points + bonus) * multiplier),
+        }
+
+
+@lru_cache(maxsize=None)
+def default_rules() -> ScoringRules:
+    """The rules in scoring_rules.json, loaded once."""
+    return ScoringRules.from_file(DEFAULT_RULES_FILE)
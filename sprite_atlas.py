@@ -0,0 +1,169 @@
+"""
+Sprite atlas module for PokeJong.
+Packs the sprite of every species in a tile set into one image so the GUI
+decodes and allocates once per game instead of once per species.
+"""
+
+import io
+import json
+import math
+import os
+import requests
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageTk
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sprite_config import SPRITE_URL, SPRITE_INDEX_FILE
+
+
+def fetch_sprite(pokemon_id: int, width: int, height: int) -> Image.Image:
+    """
+    Fetch a species' artwork and resize it to the tile size.
+    
+    Args:
+        pokemon_id: The Pokemon ID to fetch artwork for
+        width: Target width in pixels
+        height: Target height in pixels
+        
+    Returns:
+        RGBA image of the requested size (a grey block if the fetch failed)
+    """
+    url = SPRITE_URL.format(pokemon_id=pokemon_id)
+    try:
+        response = requests.get(url, timeout=5)
+        response.raise_for_status()
+        image = Image.open(io.BytesIO(response.content)).convert('RGBA')
+        return image.resize((width, height), Image.Resampling.LANCZOS)
+    except (requests.RequestException, OSError, ValueError) as e:
+        # OSError covers PIL's UnidentifiedImageError for corrupt or non-image bodies
+        print(f"Error loading sprite for Pokemon {pokemon_id}: {e}")
+        return placeholder_sprite(width, height)
+
+
+def placeholder_sprite(width: int, height: int) -> Image.Image:
+    """Grey block shown for species whose sprite could not be loaded."""
+    return Image.new('RGBA', (width, height), color='grey')
+
+
+class SpriteIndex:
+    """Reads a sprite directory produced by preprocess_sprites.py."""
+
+    def __init__(self, sprite_dir: str, scale: int = 1):
+        """
+        Args:
+            sprite_dir: Directory containing index.json
+            scale: Which pre-resized scale to load
+        """
+        self.sprite_dir = sprite_dir
+        self.scale = scale
+        with open(os.path.join(sprite_dir, SPRITE_INDEX_FILE), encoding='utf-8') as f:
+            self.index = json.load(f)
+
+    def load(self, pokemon_id: int, width: int, height: int) -> Image.Image:
+        """
+        Loader for SpriteAtlas.build: opens the pre-resized file when its size matches,
+        otherwise falls back to fetch_sprite (which resizes).
+        """
+        files = self.index['sprites'].get(str(pokemon_id), {})
+        relative = files.get(str(self.scale))
+        if relative:
+            try:
+                image = Image.open(os.path.join(self.sprite_dir, relative)).convert('RGBA')
+            except (OSError, ValueError) as e:
+                print(f"Error reading sprite for Pokemon {pokemon_id} from {self.sprite_dir}: {e}")
+            else:
+                if image.size == (width, height):
+                    return image
+        return fetch_sprite(pokemon_id, width, height)
+
+
+class SpriteAtlas:
+    """A single packed image holding one fixed-size slot per species."""
+
+    def __init__(self, image: Image.Image, slots: Dict[int, Tuple[int, int, int, int]], tile_width: int, tile_height: int):
+        """
+        Initialize an atlas from an already packed image.
+        
+        The PIL image is released once tile_view() has converted it to a Tk photo,
+        so only one full copy of the atlas stays in memory.
+        
+        Args:
+            image: The packed atlas image
+            slots: Maps pokemon_id to its (x0, y0, x1, y1) box in the image
+            tile_width: Width of every slot
+            tile_height: Height of every slot
+        """
+        self.image: Optional[Image.Image] = image
+        self.slots = slots
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self._photo: Optional[ImageTk.PhotoImage] = None
+
+    @classmethod
+    def build(cls, pokemon_ids: Iterable[int], tile_width: int, tile_height: int,
+              loader: Callable[[int, int, int], Image.Image] = fetch_sprite,
+              max_workers: int = 8) -> 'SpriteAtlas':
+        """
+        Load every species' sprite and pack them into a near-square grid.
+        
+        Args:
+            pokemon_ids: Species in the tile set (duplicates are ignored)
+            tile_width: Width of each slot
+            tile_height: Height of each slot
+            loader: Returns a tile-sized image for (pokemon_id, width, height)
+            max_workers: Number of sprites loaded concurrently
+            
+        Returns:
+            SpriteAtlas instance
+        """
+        pokemon_ids = sorted(set(pokemon_ids))
+        columns = max(1, math.ceil(math.sqrt(len(pokemon_ids))))
+        rows = max(1, math.ceil(len(pokemon_ids) / columns))
+        atlas = Image.new('RGBA', (columns * tile_width, rows * tile_height))
+
+        def load(pokemon_id: int) -> Image.Image:
+            # One bad sprite must not abort the whole atlas
+            try:
+                return loader(pokemon_id, tile_width, tile_height)
+            except Exception as e:
+                print(f"Error loading sprite for Pokemon {pokemon_id}: {e}")
+                return placeholder_sprite(tile_width, tile_height)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            sprites = executor.map(load, pokemon_ids)
+
+            slots = {}
+            for slot, (pokemon_id, sprite) in enumerate(zip(pokemon_ids, sprites)):
+                x0 = (slot % columns) * tile_width
+                y0 = (slot // columns) * tile_height
+                atlas.paste(sprite, (x0, y0))
+                slots[pokemon_id] = (x0, y0, x0 + tile_width, y0 + tile_height)
+
+        return cls(atlas, slots, tile_width, tile_height)
+
+    def __contains__(self, pokemon_id: int) -> bool:
+        return pokemon_id in self.slots
+
+    def crop(self, pokemon_id: int) -> Image.Image:
+        """Return a standalone PIL copy of one species' sprite (before tile_view() releases the PIL atlas)."""
+        if self.image is None:
+            raise RuntimeError("The PIL atlas was released when it was converted for Tk")
+        return self.image.crop(self.slots[pokemon_id])
+
+    def tile_view(self, pokemon_id: int, master: Optional[tk.Misc] = None) -> tk.PhotoImage:
+        """
+        Return a Tk image for one species, copied out of the atlas inside Tk.
+        
+        The atlas is converted to a Tk photo only once, after which the PIL copy is
+        dropped; each view is a pixel copy of its slot, so no PIL decode or conversion
+        happens per species. Views are small and live in the GUI's bounded ImageCache.
+        """
+        if self._photo is None:
+            self._photo = ImageTk.PhotoImage(self.image, master=master)
+            self.image = None
+
+        x0, y0, x1, y1 = self.slots[pokemon_id]
+        view = tk.PhotoImage(master=master, width=self.tile_width, height=self.tile_height)
+        view.tk.call(view, 'copy', str(self._photo), '-from', x0, y0, x1, y1, '-to', 0, 0)
+        return view
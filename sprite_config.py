@@ -0,0 +1,11 @@
+"""
+Sprite settings shared by the GUI and the offline tools.
+Kept free of tkinter so command-line tools (and their worker processes) can
+import it on machines without a display.
+"""
+
+# Tile size in pixels at 1x scale
+TILE_WIDTH, TILE_HEIGHT = 80, 100
+
+SPRITE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/other/official-artwork/{pokemon_id}.png"
+SPRITE_INDEX_FILE = "index.json"
@@ -3,9 +3,11 @@ Simple tests for PokeJong game components.
 """
 
 import sys
+from collections import Counter
 from pokemon_tile import PokemonTile, PokemonTileFactory
+from tile_source import StubSource, LocalFileSource
 from player import Player
-from game import PokeJongGame
+from game import PokeJongGame, is_winning_counts
 
 
 def test_pokemon_tile():
@@ -26,15 +28,17 @@ def test_pokemon_tile_factory():
     """Test PokemonTileFactory."""
     print("\nTesting PokemonTileFactory...")
     
-    # Test single tile creation
-    tile = PokemonTileFactory.create_tile(1)
+    # Test single tile creation (in-process source, no network needed)
+    source = StubSource({1: "bulbasaur"})
+    tile = PokemonTileFactory.create_tile(1, source)
     assert tile is not None, "Should create a tile"
     assert tile.pokemon_id == 1, "Pokemon ID should match"
     assert tile.points in [5, 10], "Points should be 5 or 10"
+    assert tile.name == "Bulbasaur", "Name should come from the source"
     print(f"  Created tile: {tile}")
     
     # Test tile set creation
-    tiles = PokemonTileFactory.create_tile_set(num_pokemon=5, num_copies=4)
+    tiles = PokemonTileFactory.create_tile_set(num_pokemon=5, num_copies=4, source=source)
     assert len(tiles) == 20, "Should create 5 Pokemon x 4 copies = 20 tiles"
     
     # Count occurrences of each Pokemon
@@ -99,10 +103,9 @@ def test_game_setup():
     print("\nTesting game setup...")
     game = PokeJongGame("Alice", "Bob")
     
-    print("  Fetching Pokemon data from PokeAPI (this may take a moment)...")
     # Use 10 Pokemon for testing: 10 x 4 copies = 40 tiles
     # 13 + 13 = 26 tiles dealt to players, 14 remaining in draw pile
-    game.setup_game(num_pokemon=10)
+    game.setup_game(num_pokemon=10, source=StubSource())
     
     # Each player should have 13 tiles
     assert len(game.player1.hand) == 13, "Player 1 should have 13 tiles"
@@ -114,6 +117,872 @@ def test_game_setup():
     print("✓ Game setup tests passed!")
 
 
+def test_win_condition_counts():
+    """Test the 4 Melds + 1 Pair check on sparse count maps."""
+    print("\nTesting win condition counts...")
+    assert is_winning_counts({1: 3, 2: 3, 3: 3, 4: 3, 5: 2}), "4 Pungs + Pair should win"
+    assert is_winning_counts({1: 3, 2: 3, 3: 3, 4: 5}), "Pung + Pair of the same ID should win"
+    assert is_winning_counts({1: 3, 2: 3, 3: 3, 4: 3, 5: 2, 6: 0}), "Zero counts should be ignored"
+    assert not is_winning_counts({1: 3, 2: 3, 3: 3, 4: 3, 5: 1, 6: 1}), "Two singles should not win"
+    assert not is_winning_counts({1: 3, 2: 3, 3: 4, 4: 2, 5: 2}), "Two pairs should not win"
+    assert not is_winning_counts({1: 3, 2: 3, 3: 3, 4: 3, 5: 3}), "A hand needs a pair"
+    
+    player = Player("TestPlayer", 1)
+    for pokemon_id in [1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4, 5]:
+        player.draw_tile(PokemonTile(pokemon_id, f"Pokemon{pokemon_id}", 5))
+    game = PokeJongGame("Alice", "Bob")
+    assert game.check_win_condition(player=player, claimed_tile=PokemonTile(5, "Pokemon5", 5)), "Ron on the pair should win"
+    assert game.winner is player, "Winner should be recorded"
+    
+    print("✓ Win condition count tests passed!")
+
+
+def test_large_board_setup():
+    """Test offline large-board setup with hundreds of species."""
+    print("\nTesting large-board setup...")
+    game = PokeJongGame("Alice", "Bob")
+    game.setup_game(num_pokemon=500, offline=True)
+    
+    assert len(game.draw_pile) == 500 * 4 - 26, "Draw pile should hold the undealt tiles"
+    assert sum(game.player1.hand_counts.values()) == 13, "Hand counts should track the hand"
+    
+    discarded = game.player1.discard_tile(0)
+    assert game.player1.hand_counts.get(discarded.pokemon_id, 0) == sum(
+        1 for t in game.player1.hand if t.pokemon_id == discarded.pokemon_id), "Hand counts should follow discards"
+    
+    print("✓ Large-board setup tests passed!")
+
+
+def test_sprite_atlas():
+    """Test packing sprites into a single atlas image."""
+    print("\nTesting SpriteAtlas...")
+    from PIL import Image
+    from sprite_atlas import SpriteAtlas
+
+    def loader(pokemon_id, width, height):
+        return Image.new('RGBA', (width, height), color=(pokemon_id, 0, 0, 255))
+
+    atlas = SpriteAtlas.build([3, 1, 2, 1, 5], 8, 10, loader=loader)
+    assert len(atlas.slots) == 4, "Each species should get exactly one slot"
+    assert atlas.image.size == (16, 20), "4 species should pack into a 2x2 grid"
+    assert 5 in atlas and 4 not in atlas, "Membership should follow the species list"
+    
+    sprite = atlas.crop(5)
+    assert sprite.size == (8, 10), "Crops should be tile-sized"
+    assert sprite.getpixel((0, 0)) == (5, 0, 0, 255), "Crop should come from the species' slot"
+    
+    def flaky_loader(pokemon_id, width, height):
+        if pokemon_id == 2:
+            raise OSError("cannot identify image file")
+        return loader(pokemon_id, width, height)
+    
+    import contextlib
+    import io
+    with contextlib.redirect_stdout(io.StringIO()):
+        partial = SpriteAtlas.build([1, 2, 3], 8, 10, loader=flaky_loader)
+    assert partial.crop(2).getpixel((0, 0))[:3] == (128, 128, 128), "A corrupt sprite should become a placeholder"
+    assert partial.crop(3).getpixel((0, 0)) == (3, 0, 0, 255), "Other sprites should still load"
+    
+    print("✓ SpriteAtlas tests passed!")
+
+
+def test_image_cache():
+    """Test the byte-budgeted LRU image cache."""
+    print("\nTesting ImageCache...")
+    from PIL import Image
+    from image_cache import ImageCache
+
+    tile_bytes = 8 * 10 * 4
+    cache = ImageCache(max_bytes=2 * tile_bytes)
+    cache.put(1, Image.new('RGBA', (8, 10)))
+    cache.put(2, Image.new('RGBA', (8, 10)))
+    assert cache.get(1) is not None, "Cached image should hit"
+    cache.put(3, Image.new('RGBA', (8, 10)))
+    assert 2 not in cache and 1 in cache, "Least recently used image should be evicted"
+    assert cache.get(2) is None, "Evicted image should miss"
+    
+    cache.pin(1)
+    cache.pin(3)
+    cache.put(4, Image.new('RGBA', (8, 10)))
+    assert 1 in cache and 3 in cache, "Pinned images should survive eviction"
+    assert 4 not in cache, "Unpinned image should go when the cache is over budget"
+    cache.unpin(1)
+    cache.put(5, Image.new('RGBA', (8, 10)))
+    assert 1 not in cache and 3 in cache and 5 in cache, "Unpinned image should become evictable again"
+    assert cache.current_bytes <= cache.max_bytes, "Cache should stay within budget"
+    
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 1, 3), f"Unexpected stats {stats}"
+    
+    # A screen of tiles larger than the budget: each new image must survive its own insertion
+    screen = ImageCache(max_bytes=tile_bytes)
+    shown = [screen.get_or_load(key, lambda: Image.new('RGBA', (8, 10)), pin=True) for key in range(5)]
+    assert all(key in screen for key in range(5)), "Images pinned on load should never be evicted"
+    assert all(screen.get(key) is image for key, image in enumerate(shown)), "Cache should hold the shown images"
+    for key in range(5):
+        screen.unpin(key)
+    assert screen.current_bytes <= screen.max_bytes, "Unpinning should bring the cache back within budget"
+    
+    print("✓ ImageCache tests passed!")
+
+
+class _FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = headers or {}
+
+    def json(self):
+        return self._data
+
+    def iter_content(self, chunk_size=1):
+        import json
+        body = json.dumps(self._data).encode('utf-8')
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+class _FakeSession:
+    """Replays a scripted list of responses/exceptions and records request headers."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = []
+        self.urls = []
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.calls.append(dict(headers or {}))
+        self.urls.append(url)
+        result = self.script.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_pokeapi_client():
+    """Test retries, conditional requests and the circuit breaker."""
+    print("\nTesting PokeAPIClient...")
+    import requests
+    from pokeapi_client import PokeAPIClient, CircuitBreaker, CircuitOpenError
+
+    # Transient errors are retried, then validators are used for revalidation
+    session = _FakeSession([
+        requests.ConnectionError("down"),
+        _FakeResponse(503),
+        _FakeResponse(200, {'name': 'bulbasaur'}, {'ETag': '"v1"'}),
+        _FakeResponse(304),
+    ])
+    client = PokeAPIClient(session=session, sleep=lambda seconds: None)
+    assert client.get_json("https://example/1") == {'name': 'bulbasaur'}, "Should succeed after retries"
+    assert client.get_json("https://example/1") == {'name': 'bulbasaur'}, "304 should be served from memory"
+    assert session.calls[-1].get('If-None-Match') == '"v1"', "Refresh should send the ETag"
+    
+    # Repeated failures open the circuit so later calls fail without touching the network
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    session = _FakeSession([requests.Timeout("slow")] * 4 + [_FakeResponse(200, {'name': 'ivysaur'})])
+    client = PokeAPIClient(session=session, max_retries=1, breaker=breaker, sleep=lambda seconds: None)
+    for _ in range(2):
+        try:
+            client.get_json("https://example/2")
+            assert False, "Timeouts should raise"
+        except CircuitOpenError:
+            assert False, "Circuit should still be closed"
+        except requests.RequestException:
+            pass
+    try:
+        client.get_json("https://example/2")
+        assert False, "Open circuit should fail fast"
+    except CircuitOpenError:
+        pass
+    assert len(session.calls) == 4, "Open circuit should not make requests"
+    
+    now[0] = 10.0
+    assert client.get_json("https://example/2") == {'name': 'ivysaur'}, "Probe should go through after the cool-down"
+    assert breaker.state == 'closed', "Successful probe should close the circuit"
+    
+    # A probe failing with a non-retried error must reopen the circuit, not leave it half-open
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    now[0] = 20.0
+    for error in (requests.TooManyRedirects("loop"), RuntimeError("bug")):
+        now[0] += 10
+        client = PokeAPIClient(session=_FakeSession([error]), breaker=breaker, sleep=lambda seconds: None)
+        try:
+            client.get_json("https://example/3")
+            assert False, "The probe error should propagate"
+        except (requests.TooManyRedirects, RuntimeError):
+            pass
+        assert breaker.state == 'open', f"{type(error).__name__} during a probe should reopen the circuit"
+    
+    # A 304 to a request sent without validators is an error, not a cache hit
+    client = PokeAPIClient(session=_FakeSession([_FakeResponse(304)]), sleep=lambda seconds: None)
+    try:
+        client.get_json("https://example/4")
+        assert False, "An unconditional 304 should raise"
+    except requests.HTTPError:
+        pass
+    
+    print("✓ PokeAPIClient tests passed!")
+
+
+def test_species_listing():
+    """Test resolving a tile set from the paginated list endpoint."""
+    print("\nTesting bulk species listing...")
+    import json
+    from pokeapi_client import PokeAPIClient, iter_json_array
+    from tile_source import PokeAPISource
+
+    document = {'count': 1302, 'next': 'https://pokeapi.co/api/v2/pokemon?offset=3&limit=3', 'previous': None,
+                'results': [{'name': 'bulbasaur', 'url': 'https://pokeapi.co/api/v2/pokemon/1/'},
+                            {'name': 'ivysaur', 'url': 'https://pokeapi.co/api/v2/pokemon/2/'}]}
+    text = json.dumps(document)
+    pieces = [text[i:i + 7] for i in range(0, len(text), 7)]
+    assert list(iter_json_array(pieces, 'results')) == document['results'], "Chunked parsing should match json.loads"
+    
+    # The list covers IDs 1-2; ID 3 is missing from it and falls back to a per-species fetch
+    session = _FakeSession([_FakeResponse(200, document), _FakeResponse(200, {'results': []}),
+                            _FakeResponse(200, {'id': 3, 'name': 'venusaur'})])
+    source = PokeAPISource("https://pokeapi.co/api/v2/pokemon", client=PokeAPIClient(session=session), page_size=2)
+    names = source.fetch_names([1, 2, 3])
+    assert [names[i] for i in (1, 2, 3)] == ['bulbasaur', 'ivysaur', 'venusaur'], "Should name every species"
+    assert session.urls[:2] == ["https://pokeapi.co/api/v2/pokemon?limit=2&offset=0",
+                                "https://pokeapi.co/api/v2/pokemon?limit=1&offset=2"], "Should page through the list"
+    assert session.urls[2] == "https://pokeapi.co/api/v2/pokemon/3", "Only the missing ID should be fetched alone"
+    
+    # A second lookup revalidates the list page and replays it from memory on a 304
+    session = _FakeSession([_FakeResponse(200, document, {'ETag': '"list-v1"'}), _FakeResponse(304)])
+    source = PokeAPISource("https://pokeapi.co/api/v2/pokemon", client=PokeAPIClient(session=session))
+    assert source.fetch_names([1, 2]) == source.fetch_names([1, 2]) == {1: 'bulbasaur', 2: 'ivysaur'}, \
+        "A 304 should replay the cached list entries"
+    assert session.calls[1].get('If-None-Match') == '"list-v1"', "List refreshes should send the ETag"
+    
+    # Sparse IDs list only the spans around them, not everything in between
+    far = {'results': [{'name': 'kingambit', 'url': 'https://pokeapi.co/api/v2/pokemon/983/'}]}
+    session = _FakeSession([_FakeResponse(200, document), _FakeResponse(200, far)])
+    source = PokeAPISource("https://pokeapi.co/api/v2/pokemon", client=PokeAPIClient(session=session))
+    assert source.fetch_names([1, 2, 983]) == {1: 'bulbasaur', 2: 'ivysaur', 983: 'kingambit'}, "Should name sparse IDs"
+    assert session.urls == ["https://pokeapi.co/api/v2/pokemon?limit=2&offset=0",
+                            "https://pokeapi.co/api/v2/pokemon?limit=1&offset=982"], "Should skip the gap"
+    
+    # fetch_many still returns full documents, one request per species
+    session = _FakeSession([_FakeResponse(200, {'id': 3, 'name': 'venusaur', 'height': 20})])
+    source = PokeAPISource("https://pokeapi.co/api/v2/pokemon", client=PokeAPIClient(session=session))
+    assert source.fetch_many([3]) == {3: {'id': 3, 'name': 'venusaur', 'height': 20}}, "Documents should be complete"
+    
+    tiles = PokemonTileFactory.create_tile_set(2, num_copies=4,
+                                               source=PokeAPISource(client=PokeAPIClient(session=_FakeSession(
+                                                   [_FakeResponse(200, document)]))))
+    assert sorted({t.name for t in tiles}) == ['Bulbasaur', 'Ivysaur'] and len(tiles) == 8, \
+        "create_tile_set should be resolved from one list call"
+    
+    print("✓ Bulk species listing tests passed!")
+
+
+def test_local_file_source():
+    """Test loading species from a local JSON file."""
+    print("\nTesting LocalFileSource...")
+    import contextlib
+    import io
+    import json
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = f"{tmp_dir}/species.json"
+        with open(path, 'w') as f:
+            json.dump([{'id': 1, 'name': 'bulbasaur'}, {'id': 2, 'name': 'ivysaur'}], f)
+        source = LocalFileSource(path)
+        
+        tiles = PokemonTileFactory.create_tile_set(num_pokemon=3, num_copies=2, source=source)
+        names = {tile.pokemon_id: tile.name for tile in tiles}
+        assert names == {1: "Bulbasaur", 2: "Ivysaur", 3: "Pokemon3"}, f"Unexpected names {names}"
+        
+        with open(f"{tmp_dir}/25.json", 'w') as f:
+            json.dump({'id': 25, 'name': 'pikachu'}, f)
+        assert LocalFileSource(tmp_dir).fetch_pokemon(25)['name'] == 'pikachu', "Should read per-species files"
+        
+        # Single-file problems fall back to placeholders, as a missing per-species file does
+        with open(f"{tmp_dir}/broken.json", 'w') as f:
+            f.write("[{not json")
+        with open(f"{tmp_dir}/no_id.json", 'w') as f:
+            json.dump([{'name': 'mew'}, {'id': 2, 'name': 'ivysaur'}], f)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for bad in ("missing.json", "broken.json"):
+                tiles = PokemonTileFactory.create_tile_set(2, num_copies=1, source=LocalFileSource(f"{tmp_dir}/{bad}"))
+                assert sorted(t.name for t in tiles) == ["Pokemon1", "Pokemon2"], f"{bad} should give placeholders"
+            tiles = PokemonTileFactory.create_tile_set(2, num_copies=1, source=LocalFileSource(f"{tmp_dir}/no_id.json"))
+        assert sorted(t.name for t in tiles) == ["Ivysaur", "Pokemon1"], "Entries without an id should be skipped"
+    
+    print("✓ LocalFileSource tests passed!")
+
+
+def test_tournament():
+    """Test seeded headless games and the round-robin tournament runner."""
+    print("\nTesting Tournament...")
+    import contextlib
+    import io
+    from tournament import Tournament, play_game, random_discard, discard_loneliest
+
+    species = [PokemonTileFactory.create_tile(i, StubSource()) for i in range(1, 11)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = play_game([random_discard, discard_loneliest], species, seed=7)
+        second = play_game([random_discard, discard_loneliest], species, seed=7)
+    assert first == second, "The same seed should replay the same game"
+    assert first['turns'] > 0, "Some discards should be made"
+    
+    report = Tournament({'random': random_discard, 'loneliest': discard_loneliest}, num_pokemon=10,
+                        max_workers=2, batch_size=4, min_pairs=4, max_pairs=8).run()
+    pairing = report['pairings'][0]
+    assert 8 <= pairing['games'] <= 16, "Each pair of seeds should play both seatings"
+    standings = report['standings']
+    assert standings['random']['games'] == standings['loneliest']['games'] == pairing['games'], "Every game should count for both"
+    assert abs(standings['random']['elo'] + standings['loneliest']['elo'] - 3000) < 1e-6, "Elo should be zero-sum"
+    
+    print("✓ Tournament tests passed!")
+
+
+def test_persistent_game_state():
+    """Test forking and undoing immutable game states."""
+    print("\nTesting GameState...")
+    from game_state import GameState, GameHistory
+
+    game = PokeJongGame("Alice", "Bob")
+    game.setup_game(num_pokemon=10, source=StubSource())
+    start = GameState.from_game(game)
+    history = GameHistory(start)
+    
+    drawn = history.push(start.draw_tile())
+    assert len(drawn.current_player.hand) == 14 and len(start.current_player.hand) == 13, "Forks should not touch the parent"
+    assert drawn.wall is start.wall and drawn.wall_top == start.wall_top - 1, "Drawing should share the wall"
+    assert drawn.other_player is start.other_player, "Untouched players should be shared"
+    
+    discarded = history.push(drawn.discard_tile(0))
+    assert discarded.discard_pile.head == drawn.current_player.hand[0], "Discard should top the pile"
+    assert discarded.discard_tile(99) is None, "Bad index should fail like Player.discard_tile"
+    
+    assert history.undo() is drawn and history.undo() is start, "Undo should walk back through states"
+    restored = start.to_game()
+    assert [t.pokemon_id for t in restored.player1.hand] == [t.pokemon_id for t in game.player1.hand], "Round trip should keep hands"
+    assert len(restored.draw_pile) == len(game.draw_pile), "Round trip should keep the wall"
+    
+    # Turn count, the win and the scoring rules survive a round trip too
+    game.turn_count = 7
+    game.tsumo_multiplier = 3
+    game.game_over, game.winner, game.win_type = True, game.player2, 'Ron'
+    game.win_details = {'base_points': 40, 'bonus': 0, 'bonuses': [], 'multiplier': 1.5, 'final_score': 60}
+    restored = GameState.from_game(game).to_game()
+    assert restored.turn_count == 7, "Round trip should keep the turn count"
+    assert restored.winner is restored.player2 and restored.win_type == 'Ron', "Round trip should keep the win"
+    assert restored.win_details == game.win_details and restored.win_details is not game.win_details, \
+        "Round trip should copy the score breakdown"
+    assert restored.scoring is game.scoring and restored.tsumo_multiplier == 3, "Round trip should keep the rules"
+    
+    # Claim a Pung on a discard
+    tiles = [PokemonTile(i, f"Pokemon{i}", 5) for i in (1, 1, 2)]
+    claim_game = PokeJongGame("Alice", "Bob")
+    claim_game.player1.draw_tile(PokemonTile(1, "Pokemon1", 5))
+    for tile in tiles:
+        claim_game.player2.draw_tile(tile)
+    state = GameState.from_game(claim_game).discard_tile(0).claim_meld('PUNG')
+    assert state.current == 1 and state.discard_pile is None, "Claimant should take the tile and the turn"
+    assert len(state.players[1].hand) == 1 and state.players[1].score == 15, "Claim should meld and score"
+    
+    print("✓ GameState tests passed!")
+
+
+def test_rl_env_matches_game():
+    """Test that the vectorized environment follows the PokeJongGame rules."""
+    print("\nTesting PokeJongVecEnv...")
+    import contextlib
+    import io
+    import numpy as np
+    from rl_env import PokeJongVecEnv
+
+    batch = PokeJongVecEnv(8, num_pokemon=10, seed=3).reset()
+    assert batch['own_counts'].shape == (8, 10) and batch['melds'].shape == (8, 2, 10), "Observations should be fixed-shape"
+    assert (batch['own_counts'].sum(axis=1) == 14).all(), "Dealer should start with 14 tiles"
+
+    rng = np.random.default_rng(0)
+    for seed in range(8):
+        env = PokeJongVecEnv(1, num_pokemon=10, seed=seed, auto_reset=False)
+        obs = env.reset()
+        # Replay the environment's wall in a PokeJongGame with the same discards
+        game = PokeJongGame("Seat 1", "Seat 2")
+        game.deal([PokemonTile(int(i) + 1, f"Pokemon{int(i) + 1}", 5) for i in env.walls[0]])
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.draw_tile()
+            done = False
+            while not done:
+                action = int(rng.choice(np.flatnonzero(obs['action_mask'][0])))
+                game.take_turn(next(i for i, t in enumerate(game.current_player.hand) if t.pokemon_id == action + 1))
+                obs, rewards, dones, info = env.step(np.array([action]))
+                done = bool(dones[0])
+                if not done:
+                    own = [game.current_player.hand_counts.get(i + 1, 0) for i in range(10)]
+                    assert own == obs['own_counts'][0].tolist(), "Hands should match the game"
+        
+        assert (game.player1.score, game.player2.score) == tuple(info['scores'][0]), "Scores should match the game"
+        if game.winner is not None:
+            assert info['winner'][0] == (0 if game.winner is game.player1 else 1), "Winner should match the game"
+    
+    print("✓ PokeJongVecEnv tests passed!")
+
+
+def test_hand_analysis():
+    """Test hand analysis and the background hint worker."""
+    print("\nTesting hand analysis...")
+    import time
+    from hand_analysis import analyze_hand, HintWorker, hand_signature
+
+    waiting = analyze_hand({1: 3, 2: 3, 3: 3, 4: 3, 5: 1}, {})
+    assert waiting.waits == [5] and waiting.distance == 1, "Single wait on the pair"
+    
+    discarding = analyze_hand({1: 2, 2: 2, 3: 3, 4: 3, 5: 1, 6: 3}, {})
+    assert discarding.best_discard == 5 and discarding.waits == [1, 2], "Should drop the lone tile for a double wait"
+    assert analyze_hand({1: 3, 2: 3, 3: 3, 4: 3, 5: 2}, {}).distance == 0, "Complete hand needs nothing"
+    assert analyze_hand({5: 1, 6: 1, 2: 2}, {1: 3, 3: 3, 4: 3}).distance == 2, "Melds should count towards the win"
+    spare = analyze_hand({1: 1, 2: 3, 3: 3, 4: 2, 5: 1}, {1: 3})
+    assert spare.distance == 2, "A spare copy of a melded species should only need discarding"
+    
+    player = Player("TestPlayer", 1)
+    for pokemon_id in [1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4, 5]:
+        player.draw_tile(PokemonTile(pokemon_id, f"Pokemon{pokemon_id}", 5))
+    worker = HintWorker()
+    signature = hand_signature(player)
+    assert worker.request(signature) is None, "First request should be computed in the background"
+    results = []
+    for _ in range(100):
+        results = worker.poll()
+        if results:
+            break
+        time.sleep(0.01)
+    assert results and results[0][1].waits == [5], "Worker should deliver the analysis"
+    assert worker.request(signature).waits == [5], "Repeated positions should be served from the cache"
+    worker.stop()
+    
+    worker = HintWorker(max_entries=2)
+    signatures = [(((pokemon_id, 2),), ()) for pokemon_id in (1, 2, 3)]
+    for signature in signatures:
+        worker.request(signature)
+        for _ in range(100):
+            if worker.poll():
+                break
+            time.sleep(0.01)
+    assert len(worker._cache) == 2, "The cache should stay within max_entries"
+    assert signatures[0] not in worker._cache, "The least recently used analysis should be evicted"
+    worker.stop()
+    
+    print("✓ Hand analysis tests passed!")
+
+
+def test_game_recorder():
+    """Test streaming game and turn records to chunked CSV."""
+    print("\nTesting GameRecorder...")
+    import contextlib
+    import csv
+    import io
+    import tempfile
+    from game_recorder import GameRecorder
+    from tournament import play_game, discard_loneliest
+
+    species = [PokemonTileFactory.create_tile(i, StubSource()) for i in range(1, 11)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with GameRecorder(f"{tmp_dir}/games.csv", f"{tmp_dir}/turns.csv", fmt='csv', chunk_size=3) as recorder:
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = [play_game([discard_loneliest, discard_loneliest], species, seed, recorder=recorder)
+                           for seed in range(5)]
+        
+        with open(f"{tmp_dir}/games.csv") as f:
+            games = list(csv.DictReader(f))
+        with open(f"{tmp_dir}/turns.csv") as f:
+            turns = list(csv.DictReader(f))
+    
+    assert [int(g['seed']) for g in games] == list(range(5)), "One row per game, in order"
+    assert [int(g['turns']) for g in games] == [r['turns'] for r in results], "Turn counts should match"
+    assert len(turns) == sum(r['turns'] for r in results), "One row per discard"
+    for game in games:
+        if game['win_type']:
+            assert int(game['final_score']) > 0 and game['winner'], "Wins should carry a score breakdown"
+    
+    print("✓ GameRecorder tests passed!")
+
+
+def test_preprocess_sprites():
+    """Test the offline multi-resolution sprite preprocessing."""
+    print("\nTesting sprite preprocessing...")
+    import os
+    import tempfile
+    from PIL import Image
+    from preprocess_sprites import preprocess_sprites
+    from sprite_atlas import SpriteIndex
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source_dir = os.path.join(tmp_dir, "raw")
+        out_dir = os.path.join(tmp_dir, "sprites")
+        os.makedirs(source_dir)
+        for pokemon_id in (1, 25):
+            Image.new('RGBA', (475, 475), color=(pokemon_id, 0, 0, 255)).save(os.path.join(source_dir, f"{pokemon_id}.png"))
+        with open(os.path.join(source_dir, "7.png"), 'wb') as f:
+            f.write(b"not a png")
+        
+        index = preprocess_sprites(out_dir, source_dir=source_dir, scales=(1, 2), width=8, height=10, workers=2)
+        assert sorted(index['sprites']) == ['1', '25'], "Every good sprite should be indexed; the corrupt one skipped"
+        with Image.open(os.path.join(out_dir, index['sprites']['25']['2'])) as image:
+            assert image.size == (16, 20), "2x sprites should be double the tile size"
+        
+        sprite = SpriteIndex(out_dir).load(25, 8, 10)
+        assert sprite.size == (8, 10) and sprite.getpixel((4, 5))[0] == 25, "Index should load the 1x sprite"
+    
+    print("✓ Sprite preprocessing tests passed!")
+
+
+def test_engine_worker():
+    """Test running game commands on the engine thread."""
+    print("\nTesting GameEngineWorker...")
+    import contextlib
+    import io
+    import time
+    from engine_worker import GameEngineWorker
+    from hand_analysis import hand_signature
+
+    game = PokeJongGame("Alice", "Bob")
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.setup_game(num_pokemon=10, source=StubSource())
+        game.draw_tile()
+        worker = GameEngineWorker(game)
+        worker.submit('discard', 0)
+        worker.submit('discard', 99)
+        updates = []
+        for _ in range(200):
+            updates.extend(worker.poll())
+            if len(updates) == 2:
+                break
+            time.sleep(0.01)
+        worker.stop()
+        worker.join(1)
+    
+    assert [u['ok'] for u in updates] == [True, False], "Commands should run in order and report success"
+    assert 'hands' in updates[0]['delta'], "Delta should carry the changed hand sizes"
+    assert 'winner' not in updates[0]['delta'] or game.game_over, "Unchanged fields should be left out"
+    assert updates[1]['delta'] == {}, "A failed command should change nothing"
+    drawn = updates[0]['view']
+    assert drawn['players'][0]['hand'] == game.player1.hand, "The view should copy the hands for rendering"
+    assert drawn['players'][0]['hand'] is not game.player1.hand, "The view must not share lists with the engine"
+    assert drawn['players'][0]['discards'] == game.player1.discards, "The view should copy the discards"
+    assert drawn['hint_signature'] == hand_signature(game.current_player), "The view should carry the hint key"
+    assert worker.view()['wall_size'] == len(game.draw_pile), "view() should copy the current state"
+    
+    print("✓ GameEngineWorker tests passed!")
+
+
+def test_hand_eval():
+    """Test batch hand evaluation against the game's own scoring."""
+    print("\nTesting batch hand evaluation...")
+    import contextlib
+    import io
+    import numpy as np
+    from hand_eval import evaluate_hands
+
+    # Row 0: Tsumo win (4 pungs + pair), row 1: 13-tile hand waiting on species 5 or 6,
+    # row 2: Ron on species 60 with one meld, row 3: scattered 14 tiles
+    hands = np.zeros((4, 60), dtype=np.int64)
+    hands[0, [0, 1, 2, 3]] = 3
+    hands[0, 4] = 2
+    hands[1, [0, 1, 2]] = 3
+    hands[1, [4, 5]] = 2
+    hands[2, [0, 1, 2]] = 3
+    hands[2, 59] = 1
+    hands[3, :14] = 1
+    melds = np.zeros_like(hands)
+    melds[2, 10] = 3
+    result = evaluate_hands(hands, melds, winning_tiles=[-1, -1, 59, -1],
+                            win_type=np.array(['Tsumo', 'Tsumo', 'Ron', 'Tsumo']))
+    
+    assert result['is_win'].tolist() == [True, False, True, False], "Mod-3 rule should pick out the wins"
+    assert np.flatnonzero(result['waits'][1]).tolist() == [4, 5], "Row 1 waits on either pair"
+    assert result['num_waits'][0] == 0, "Only 13-tile rows have waits"
+    
+    # Scores should match calculate_win_score on the same positions
+    for row, claimed in [(0, None), (2, 59)]:
+        game = PokeJongGame("Alice", "Bob")
+        player = game.current_player
+        for index in np.repeat(np.arange(60), hands[row]):
+            player.draw_tile(PokemonTile(int(index) + 1, "P", 5 if index < 50 else 10))
+        for index in np.flatnonzero(melds[row]):
+            for _ in range(3):
+                player.draw_tile(PokemonTile(int(index) + 1, "P", 5))
+            player.form_meld([i for i, t in enumerate(player.hand) if t.pokemon_id == index + 1][:3])
+        player.sort_hand()
+        winning_tile = PokemonTile(claimed + 1, "P", 10) if claimed is not None else player.hand[-1]
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.calculate_win_score(player, winning_tile, 'Ron' if claimed is not None else 'Tsumo')
+        assert result['score'][row] == game.win_details['final_score'], f"Row {row} score should match the game"
+    
+    parallel = evaluate_hands(np.tile(hands, (3, 1)), np.tile(melds, (3, 1)), workers=2, chunk_size=4)
+    serial = evaluate_hands(np.tile(hands, (3, 1)), np.tile(melds, (3, 1)))
+    assert all(np.array_equal(parallel[k], serial[k]) for k in serial), "Chunked evaluation should match"
+    
+    print("✓ Batch hand evaluation tests passed!")
+
+
+def test_tile_layout():
+    """Test the virtualized tile canvas layout and hit-testing."""
+    print("\nTesting TileLayout...")
+    from tile_canvas import TileLayout, TILE_GAP, GROUP_GAP
+
+    tiles = [PokemonTile(i, f"Pokemon{i}", 5) for i in range(1, 301)]
+    layout = TileLayout([tiles], 80, 100)
+    pitch = 80 + TILE_GAP
+    assert len(layout) == 300 and layout.width == TILE_GAP + 300 * pitch, "Row should span every tile"
+    
+    first, last = layout.visible_range(10 * pitch + 40, 10 * pitch + 40 + 400)
+    assert (first, last) == (10, 16), "Only tiles overlapping the window should be drawn"
+    assert layout.visible_range(0, 0) == (0, 0), "Empty window draws nothing"
+    
+    assert layout.index_at(TILE_GAP + 5 * pitch + 10, 50) == 5, "Click inside a tile should hit it"
+    assert layout.index_at(TILE_GAP + 5 * pitch + 81, 50) is None, "Gaps should not hit a tile"
+    assert layout.index_at(TILE_GAP + 10, 150) is None, "Below the tiles should not hit"
+    
+    melds = TileLayout([tiles[:3], tiles[3:6]], 80, 100)
+    assert melds.lefts[3] - melds.lefts[2] == pitch + GROUP_GAP - TILE_GAP, "Groups should be spaced apart"
+    
+    print("✓ TileLayout tests passed!")
+
+
+def test_match():
+    """Test multi-round matches with dealer rotation and pre-built walls."""
+    print("\nTesting PokeJongMatch...")
+    import contextlib
+    import io
+    from match import PokeJongMatch
+
+    match = PokeJongMatch("Alice", "Bob", num_rounds=3, num_pokemon=10, offline=True, seed=7)
+    dealers, hands = [], []
+    with contextlib.redirect_stdout(io.StringIO()):
+        while not match.match_over:
+            game = match.next_round()
+            assert len(game.draw_pile) == 40 - 26 and len(game.player1.hand) == 13, "Round should be dealt"
+            assert (match._next_wall is not None) == (match.round_number < 3), "Next wall should already be building"
+            dealers.append(game.current_player.name)
+            hands.append([t.pokemon_id for t in game.player1.hand])
+            game.draw_tile()
+            while not game.game_over and game.current_player.hand:
+                game.take_turn(0)
+            result = match.finish_round(game)
+            assert result['scores'] == (game.player1.score, game.player2.score), "Round scores should be reported"
+    
+    assert dealers == ["Alice", "Bob", "Alice"], "Dealer should rotate each round"
+    assert match.scores == [sum(r['scores'][0] for r in match.results), sum(r['scores'][1] for r in match.results)], \
+        "Scores should accumulate across rounds"
+    
+    species = match.species
+    replay = PokeJongMatch("Alice", "Bob", num_rounds=1, num_pokemon=10, offline=True, seed=7)
+    replay.species = species
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = replay.next_round()
+    assert replay.species is species, "Tile data should be reused, not refetched"
+    assert [t.pokemon_id for t in first.player1.hand] == hands[0], "The same seed should replay the same walls"
+    replay.close()
+    
+    print("✓ PokeJongMatch tests passed!")
+
+
+def test_zobrist_hashing():
+    """Test incremental Zobrist keys against from-scratch hashes."""
+    print("\nTesting Zobrist hashing...")
+    import contextlib
+    import io
+    import random
+    from game_state import GameState
+    from zobrist import HAND, MELDS, DISCARD_PILE, hash_counts
+
+    game = PokeJongGame("Alice", "Bob")
+    keys = set()
+    with contextlib.redirect_stdout(io.StringIO()):
+        species = PokemonTileFactory.create_species(12, StubSource())
+        game.deal(PokemonTileFactory.build_wall(species, rng=random.Random(3)))
+        rng = random.Random(3)
+        game.draw_tile()
+        while not game.game_over and game.current_player.hand:
+            for player in (game.player1, game.player2):
+                assert player.hand_hash == hash_counts(HAND, player.player_id, player.hand_counts), "Hand hash drifted"
+                melds = Counter(tile.pokemon_id for meld in player.melds for tile in meld)
+                assert player.meld_hash == hash_counts(MELDS, player.player_id, melds), "Meld hash drifted"
+            assert game.discard_hash == hash_counts(DISCARD_PILE, 0, Counter(t.pokemon_id for t in game.discard_pile)), \
+                "Discard hash drifted"
+            keys.add(game.state_key())
+            game.take_turn(rng.randrange(len(game.current_player.hand)))
+    
+    assert len(keys) > 1, "Different positions should get different keys"
+    restored = GameState.from_game(game).to_game()
+    assert restored.state_key() == game.state_key(), "Snapshots should restore the same key"
+    
+    first, second = Player("A", 1), Player("A", 1)
+    tiles = [PokemonTile(i, f"Pokemon{i}", 5) for i in (1, 2, 2, 3)]
+    for tile in tiles:
+        first.draw_tile(tile)
+    for tile in reversed(tiles):
+        second.draw_tile(tile)
+    assert first.state_key() == second.state_key(), "Keys should not depend on draw order"
+    first.discard_tile(0)
+    assert first.state_key() != second.state_key(), "Discarding should change the key"
+    assert Player("A", 2).state_key() == 0, "Empty hands hash to zero"
+    
+    print("✓ Zobrist hashing tests passed!")
+
+
+def test_scoring_rules():
+    """Test the config-driven scoring rules."""
+    print("\nTesting ScoringRules...")
+    import contextlib
+    import io
+    from scoring_rules import ScoringRules, default_rules
+
+    rules = default_rules()
+    assert [rules.points_for(i) for i in (1, 50, 51, 400)] == [5, 5, 10, 10], "Default table should match the ID rule"
+    
+    custom = ScoringRules({
+        'tile_points': {'ranges': [{'max_id': 10, 'points': 1}], 'default': 3, 'species': {'25': 20}},
+        'bonuses': [{'name': 'All Pungs', 'points': 50, 'when': {'melds': 4}},
+                    {'name': 'Two Kinds', 'points': 7, 'when': {'max_species': 2, 'win_type': 'Ron'}}],
+        'multipliers': {'Tsumo': 3, 'Ron': 1},
+    })
+    assert [custom.points_for(i) for i in (4, 25, 26)] == [1, 20, 3], "Overrides and ranges should apply"
+    try:
+        ScoringRules({'bonuses': [{'name': 'Bad', 'points': 1, 'when': {'colour': 'red'}}]})
+        assert False, "Unknown conditions should be rejected when compiling"
+    except ValueError:
+        pass
+    
+    game = PokeJongGame("Alice", "Bob")
+    game.scoring = custom
+    player = game.current_player
+    for pokemon_id in [1] * 6 + [2] * 7:
+        player.draw_tile(PokemonTile(pokemon_id, "P", custom.points_for(pokemon_id)))
+    assert player.hand_points == 13, "Hand points should be a running sum"
+    player.form_meld([0, 1, 2])
+    assert (player.hand_points, player.meld_points) == (10, 3), "Meld points should move out of the hand total"
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert game.check_win_condition(player, claimed_tile=PokemonTile(2, "P", 1)), "Should win on Ron"
+    assert game.win_details['bonuses'] == [('Two Kinds', 7)], "Only the matching bonus should apply"
+    assert game.win_details['final_score'] == 10 + 3 + 1 + 7, "Ron multiplier is 1 in the custom rules"
+    
+    # The batch evaluator and the RL environment should score with the same edited rules
+    ron_score = game.win_details['final_score']
+    player.draw_tile(PokemonTile(2, "P", 1))
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.calculate_win_score(player, player.hand[-1], 'Tsumo')
+    tsumo_score = game.win_details['final_score']
+    assert tsumo_score == (11 + 3 + 1) * 3, "Tsumo uses the custom multiplier and skips the Ron-only bonus"
+    
+    import numpy as np
+    from hand_eval import evaluate_hands
+    from rl_env import PokeJongVecEnv
+    hands, melds = np.array([[3, 7], [3, 8]]), np.array([[3, 0], [3, 0]])
+    result = evaluate_hands(hands, melds, num_melds=[1, 1], winning_tiles=[1, 1],
+                            win_type=np.array(['Ron', 'Tsumo']), rules=custom)
+    assert result['score'].tolist() == [ron_score, tsumo_score], "evaluate_hands should follow the rules"
+    parallel = evaluate_hands(hands, melds, num_melds=[1, 1], winning_tiles=[1, 1],
+                              win_type=np.array(['Ron', 'Tsumo']), rules=custom, workers=2, chunk_size=1)
+    assert parallel['score'].tolist() == [ron_score, tsumo_score], "Rules should reach worker processes"
+    
+    env = PokeJongVecEnv(2, num_pokemon=2, rules=custom)
+    env.hands[:, 0], env.melds[:, 0], env.num_melds[:, 0] = hands, melds, 1
+    rows, seats, tiles = np.array([0]), np.array([0]), np.array([1])
+    assert env._win_score(rows, seats, tiles, 'Ron')[0] == ron_score, "Env Ron rewards should follow the rules"
+    assert env._win_score(rows + 1, seats, tiles, 'Tsumo')[0] == tsumo_score, "Env Tsumo rewards should too"
+    
+    # A game set up under a custom point table deals tiles priced by it, so its score matches evaluate_hands
+    flat = ScoringRules({'tile_points': {'default': 100}, 'bonuses': [], 'multipliers': {'Tsumo': 2, 'Ron': 1.5}})
+    table_game = PokeJongGame("Alice", "Bob")
+    table_game.scoring = flat
+    with contextlib.redirect_stdout(io.StringIO()):
+        table_game.setup_game(num_pokemon=10, source=StubSource())
+    pool = table_game.draw_pile + table_game.player1.hand + table_game.player2.hand
+    assert all(tile.points == 100 for tile in pool), "setup_game should price tiles with the game's rules"
+    winner = Player("Carol", 1)
+    for pokemon_id, count in ((1, 3), (2, 3), (3, 3), (4, 3), (5, 2)):
+        for tile in [t for t in pool if t.pokemon_id == pokemon_id][:count]:
+            winner.draw_tile(tile)
+    winner.sort_hand()
+    with contextlib.redirect_stdout(io.StringIO()):
+        table_game.calculate_win_score(winner, winner.hand[-1], 'Tsumo')
+    counts = np.zeros((1, 10), dtype=np.int64)
+    for pokemon_id, count in winner.hand_counts.items():
+        counts[0, pokemon_id - 1] = count
+    assert table_game.win_details['final_score'] == evaluate_hands(counts, rules=flat)['score'][0] == 3000, \
+        "The game and evaluate_hands should agree on a custom point table"
+    
+    # Walls priced by other rules (e.g. a match's shared species) are repriced when dealt
+    repriced = PokeJongGame("Alice", "Bob")
+    repriced.scoring = flat
+    repriced.deal(PokemonTileFactory.build_wall(PokemonTileFactory.create_species(10, StubSource())))
+    assert repriced.player1.hand_points == 13 * 100, "deal should reprice tiles with the game's rules"
+    
+    game.tsumo_multiplier = 4
+    assert game.scoring.multipliers['Tsumo'] == 4 and custom.multipliers['Tsumo'] == 3, \
+        "Multiplier attributes should still work without changing shared rules"
+    
+    print("✓ ScoringRules tests passed!")
+
+
+def test_lazy_tile_names():
+    """Test dealing before species names are fetched."""
+    print("\nTesting lazy tile names...")
+    import contextlib
+    import io
+    import threading
+
+    release = threading.Event()
+
+    class _GatedSource(StubSource):
+        def fetch_many(self, pokemon_ids):
+            release.wait(5)
+            return super().fetch_many(pokemon_ids)
+
+    game = PokeJongGame("Alice", "Bob")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.setup_game(num_pokemon=10, source=_GatedSource({i: f"species{i}" for i in range(1, 11)}),
+                            lazy_names=True)
+        assert len(game.player1.hand) == 13, "Dealing should not wait for names"
+        tile = game.player1.hand[0]
+        assert tile.name == f"Pokemon{tile.pokemon_id}", "Unresolved tiles show a placeholder"
+        assert tile.points == 5, "Points come from the ID alone"
+        assert game.name_resolver.poll() == [], "Nothing resolved yet"
+        
+        release.set()
+        assert game.name_resolver.wait(5), "Resolver should finish"
+        assert sorted(game.name_resolver.poll()) == list(range(1, 11)), "Every species should be reported once"
+        assert all(t.name == f"Species{t.pokemon_id}" for t in game.player1.hand + game.draw_pile), \
+            "Every copy should pick up the resolved name"
+        assert PokemonTile(1, "Bulbasaur", 5).name == "Bulbasaur", "Explicit names are unaffected"
+    finally:
+        release.set()
+    
+    # A later game with another source resolves its own names
+    other = PokeJongGame("Alice", "Bob")
+    with contextlib.redirect_stdout(io.StringIO()):
+        other.setup_game(num_pokemon=10, source=StubSource({i: f"other{i}" for i in range(1, 11)}), lazy_names=True)
+    assert other.name_resolver.wait(5), "Second resolver should finish"
+    assert sorted(other.name_resolver.poll()) == list(range(1, 11)), "Names already seen elsewhere are still fetched"
+    assert all(t.name == f"Other{t.pokemon_id}" for t in other.player1.hand), "The new source's names should show"
+    assert game.player1.hand[0].name.startswith("Species"), "The first game keeps its own names"
+    assert PokemonTile(1).name == "Pokemon1", "Tiles without a name map stay placeholders"
+    
+    print("✓ Lazy tile name tests passed!")
+
+
 def run_all_tests():
     """Run all tests."""
     print("="*60)
@@ -126,6 +995,26 @@ def run_all_tests():
         test_player()
         test_game_initialization()
         test_game_setup()
+        test_win_condition_counts()
+        test_large_board_setup()
+        test_sprite_atlas()
+        test_image_cache()
+        test_pokeapi_client()
+        test_species_listing()
+        test_local_file_source()
+        test_tournament()
+        test_persistent_game_state()
+        test_rl_env_matches_game()
+        test_hand_analysis()
+        test_game_recorder()
+        test_preprocess_sprites()
+        test_engine_worker()
+        test_hand_eval()
+        test_tile_layout()
+        test_match()
+        test_zobrist_hashing()
+        test_scoring_rules()
+        test_lazy_tile_names()
         
         print("\n" + "="*60)
         print("ALL TESTS PASSED! ✓")
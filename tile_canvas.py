@@ -0,0 +1,192 @@
+"""
+Tile canvas module for PokeJong.
+Draws a horizontal row of tiles on a single Tk Canvas. Only tiles inside the
+visible window get canvas items (and images); scrolling creates and deletes
+items at the edges, so a 200-tile discard pile costs as much as the dozen
+tiles on screen.
+"""
+
+import bisect
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from pokemon_tile import PokemonTile
+
+TILE_GAP = 4
+GROUP_GAP = 16
+SELECTED_OUTLINE = "#d04040"
+
+
+class TileLayout:
+    """Pixel positions of tiles laid out left to right in groups (a hand, or one group per meld)."""
+
+    def __init__(self, groups: Sequence[Sequence[PokemonTile]], tile_width: int, tile_height: int,
+                 gap: int = TILE_GAP, group_gap: int = GROUP_GAP):
+        """
+        Lay out tiles.
+
+        Args:
+            groups: Tile groups; tiles within a group are gap apart, groups are group_gap apart
+            tile_width: Tile width in pixels
+            tile_height: Tile height in pixels
+            gap: Space between tiles in a group
+            group_gap: Space between groups
+        """
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.tiles: List[PokemonTile] = []
+        self.lefts: List[int] = []
+        x = gap
+        for group in groups:
+            if group and self.tiles:
+                x += group_gap - gap
+            for tile in group:
+                self.tiles.append(tile)
+                self.lefts.append(x)
+                x += tile_width + gap
+        self.width = x
+
+    def __len__(self) -> int:
+        return len(self.tiles)
+
+    def visible_range(self, left: float, right: float) -> Tuple[int, int]:
+        """Returns [first, last) indices of tiles overlapping the x interval [left, right)."""
+        first = bisect.bisect_right(self.lefts, left - self.tile_width)
+        last = bisect.bisect_left(self.lefts, right)
+        return first, max(first, last)
+
+    def index_at(self, x: float, y: float) -> Optional[int]:
+        """Returns the index of the tile under canvas point (x, y), or None for gaps and empty space."""
+        if not 0 <= y < self.tile_height:
+            return None
+        index = bisect.bisect_right(self.lefts, x) - 1
+        if index < 0 or x >= self.lefts[index] + self.tile_width:
+            return None
+        return index
+
+
+class TileCanvas:
+    """A horizontally scrolling, virtualized tile row with click hit-testing."""
+
+    def __init__(self, parent: tk.Misc, tile_width: int, tile_height: int,
+                 acquire_image: Callable[[PokemonTile], tk.PhotoImage],
+                 release_image: Optional[Callable[[PokemonTile], None]] = None,
+                 on_click: Optional[Callable[[int], None]] = None):
+        """
+        Create the canvas and its scrollbar inside parent.
+
+        Args:
+            parent: Container widget
+            tile_width: Tile width in pixels
+            tile_height: Tile height in pixels
+            acquire_image: Returns a tile's image when it scrolls into view
+            release_image: Called when a tile's item is deleted (e.g. to unpin its image)
+            on_click: Called with the index of a clicked tile
+        """
+        self.acquire_image = acquire_image
+        self.release_image = release_image
+        self.on_click = on_click
+        self.layout = TileLayout([], tile_width, tile_height)
+        self.selected = set()
+        self.empty_text = ""
+        # index -> (image item, outline item, tile)
+        self._items: Dict[int, Tuple[int, int, PokemonTile]] = {}
+        self._empty_item = None
+
+        self.canvas = tk.Canvas(parent, height=tile_height + 2 * TILE_GAP, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(parent, orient="horizontal", command=self._xview)
+        self.canvas.configure(xscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side="top", fill="x", expand=True)
+        self.scrollbar.pack(side="top", fill="x")
+
+        self.canvas.bind("<Configure>", lambda event: self._refresh())
+        self.canvas.bind("<Button-1>", self._handle_click)
+        self.canvas.bind("<Shift-MouseWheel>", self._handle_wheel)
+        self.canvas.bind("<Button-4>", lambda event: self._xview("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda event: self._xview("scroll", 1, "units"))
+        self.canvas.bind("<Destroy>", lambda event: self._release_all() if event.widget is self.canvas else None)
+
+    def set_tiles(self, tiles: Sequence[PokemonTile], selected: Sequence[int] = (), empty_text: str = ""):
+        """Shows one group of tiles."""
+        self.set_groups([tiles], selected, empty_text)
+
+    def set_groups(self, groups: Sequence[Sequence[PokemonTile]], selected: Sequence[int] = (),
+                   empty_text: str = ""):
+        """Shows tile groups (e.g. melds) separated by a wider gap; indices run across all groups."""
+        self.clear()
+        self.layout = TileLayout(groups, self.layout.tile_width, self.layout.tile_height)
+        self.selected = set(selected)
+        self.empty_text = empty_text
+        self.canvas.configure(scrollregion=(0, 0, self.layout.width, self.layout.tile_height + 2 * TILE_GAP),
+                              xscrollincrement=self.layout.tile_width + TILE_GAP)
+        self._refresh()
+
+    def set_selected(self, selected: Sequence[int]):
+        """Updates selection outlines without rebuilding any items."""
+        self.selected = set(selected)
+        for index, (_, outline, _) in self._items.items():
+            self.canvas.itemconfigure(outline, outline=SELECTED_OUTLINE if index in self.selected else "")
+
+    def clear(self):
+        """Deletes every canvas item, releasing their images."""
+        for index in list(self._items):
+            self._delete_item(index)
+        if self._empty_item is not None:
+            self.canvas.delete(self._empty_item)
+            self._empty_item = None
+
+    def _release_all(self):
+        """Releases every image when the canvas goes away (its items go with it)."""
+        for _, _, tile in self._items.values():
+            if self.release_image:
+                self.release_image(tile)
+        self._items.clear()
+
+    def _xview(self, *args):
+        """Scrolls, then creates/deletes items for tiles entering or leaving the view."""
+        self.canvas.xview(*args)
+        self._refresh()
+
+    def _handle_wheel(self, event):
+        """Scrolls one tile per wheel notch."""
+        self._xview("scroll", -1 if event.delta > 0 else 1, "units")
+
+    def _handle_click(self, event):
+        """Maps a click to a tile index and reports it."""
+        index = self.layout.index_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y) - TILE_GAP)
+        if index is not None and self.on_click:
+            self.on_click(index)
+
+    def _refresh(self):
+        """Keeps canvas items only for the tiles inside the visible window."""
+        if not len(self.layout):
+            if self.empty_text and self._empty_item is None:
+                self._empty_item = self.canvas.create_text(TILE_GAP, self.layout.tile_height // 2,
+                                                           text=self.empty_text, anchor="w")
+            return
+        left = self.canvas.canvasx(0)
+        first, last = self.layout.visible_range(left, left + self.canvas.winfo_width())
+        for index in [i for i in self._items if not first <= i < last]:
+            self._delete_item(index)
+        for index in range(first, last):
+            if index not in self._items:
+                self._create_item(index)
+
+    def _create_item(self, index: int):
+        """Draws the tile at index."""
+        tile = self.layout.tiles[index]
+        x = self.layout.lefts[index]
+        image = self.acquire_image(tile)
+        image_item = self.canvas.create_image(x, TILE_GAP, image=image, anchor="nw")
+        outline = self.canvas.create_rectangle(x - 1, TILE_GAP - 1, x + self.layout.tile_width,
+                                               TILE_GAP + self.layout.tile_height, width=3,
+                                               outline=SELECTED_OUTLINE if index in self.selected else "")
+        self._items[index] = (image_item, outline, tile)
+
+    def _delete_item(self, index: int):
+        """Removes the tile at index from the canvas."""
+        image_item, outline, tile = self._items.pop(index)
+        self.canvas.delete(image_item, outline)
+        if self.release_image:
+            self.release_image(tile)
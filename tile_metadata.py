@@ -0,0 +1,68 @@
+"""
+Tile metadata module for PokeJong.
+Game logic only needs a tile's pokemon_id and points, so tiles can be created
+from IDs alone and play can start at once. TileNameResolver fetches the species
+names on a background thread into its own names dict; every lazily named tile
+built over that dict shows its real name from then on. Each game has its own
+resolver, so names from one source never leak into another game.
+"""
+
+import queue
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from pokemon_tile import PokemonTileFactory
+from tile_source import TileDataSource
+
+
+class TileNameResolver:
+    """Resolves species names in the background."""
+
+    def __init__(self, source: Optional[TileDataSource] = None):
+        """
+        Initialize the resolver.
+
+        Args:
+            source: Where to fetch species data (default: PokemonTileFactory's source)
+        """
+        self.source = source
+        self.names: Dict[int, str] = {}  # pokemon_id -> name, for tiles built with names=self.names
+        self._resolved = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, pokemon_ids: Iterable[int]):
+        """Start fetching names for pokemon_ids; returns immediately."""
+        pokemon_ids = [pokemon_id for pokemon_id in pokemon_ids if pokemon_id not in self.names]
+        self._thread = threading.Thread(target=self._run, args=(pokemon_ids,), daemon=True)
+        self._thread.start()
+
+    def _run(self, pokemon_ids: List[int]):
+        # One batch: a single list request against PokeAPI
+        names = PokemonTileFactory.fetch_names(pokemon_ids, self.source)
+        resolved = []
+        for pokemon_id, name in names.items():
+            if name:
+                self.names[pokemon_id] = name
+                resolved.append(pokemon_id)
+        self._resolved.put(resolved)
+
+    def poll(self) -> List[int]:
+        """Return the IDs whose names arrived since the last poll, without blocking."""
+        resolved = []
+        while True:
+            try:
+                resolved.extend(self._resolved.get_nowait())
+            except queue.Empty:
+                return resolved
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every name has been fetched (e.g. before printing a log).
+
+        Returns:
+            True if resolution finished within timeout
+        """
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
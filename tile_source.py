@@ -0,0 +1,199 @@
+"""
+Tile data source module for PokeJong.
+Pluggable backends that supply Pokemon species data to PokemonTileFactory.
+"""
+
+import json
+import os
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from pokeapi_client import PokeAPIClient
+
+# Species per /pokemon?limit=&offset= request; PokeAPI serves this in one page
+LIST_PAGE_SIZE = 1000
+# Unwanted IDs worth listing between two wanted ones to save a separate list request
+LIST_MAX_GAP = 100
+
+
+class TileDataSource:
+    """Base class for species data backends.
+    
+    A source returns PokeAPI-shaped documents (at least 'id' and 'name') for a
+    Pokemon ID, or None if the species is unavailable.
+    """
+
+    def fetch_pokemon(self, pokemon_id: int) -> Optional[Dict]:
+        """
+        Fetch one species document.
+        
+        Args:
+            pokemon_id: The Pokemon ID to fetch
+            
+        Returns:
+            Dictionary containing Pokemon data, or None if unavailable
+        """
+        raise NotImplementedError
+
+    def fetch_many(self, pokemon_ids: Iterable[int]) -> Dict[int, Optional[Dict]]:
+        """Fetch several species, returning a map of ID to document (or None)."""
+        return {pokemon_id: self.fetch_pokemon(pokemon_id) for pokemon_id in pokemon_ids}
+
+    def fetch_names(self, pokemon_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+        """
+        Fetch only the names of several species; sources may do this more cheaply than fetch_many.
+        
+        Returns:
+            Dictionary mapping each ID to its name, or None if unavailable
+        """
+        return {pokemon_id: document['name'] if document else None
+                for pokemon_id, document in self.fetch_many(pokemon_ids).items()}
+
+
+class PokeAPISource(TileDataSource):
+    """Live PokeAPI backend using the resilient PokeAPIClient."""
+
+    def __init__(self, base_url: str = "https://pokeapi.co/api/v2/pokemon",
+                 client: Optional[PokeAPIClient] = None, max_workers: int = 16,
+                 page_size: int = LIST_PAGE_SIZE):
+        """
+        Initialize the backend.
+        
+        Args:
+            base_url: PokeAPI species endpoint
+            client: HTTP client (a new PokeAPIClient if omitted)
+            max_workers: Concurrent requests used by fetch_many (and fetch_names for IDs the list misses)
+            page_size: Species per list request in list_species
+        """
+        self.base_url = base_url
+        self.client = client or PokeAPIClient()
+        self.max_workers = max_workers
+        self.page_size = page_size
+
+    def fetch_pokemon(self, pokemon_id: int) -> Optional[Dict]:
+        try:
+            return self.client.get_json(f"{self.base_url}/{pokemon_id}")
+        except requests.RequestException as e:
+            print(f"Error fetching Pokemon {pokemon_id}: {e}")
+            return None
+
+    def list_species(self, first_id: int, last_id: int) -> Dict[int, Dict]:
+        """
+        Name every species from first_id to last_id using the paginated list endpoint.
+        
+        One request covers page_size species, against one request per species for
+        fetch_pokemon, and only each entry's name and URL are parsed.
+        
+        Args:
+            first_id: Lowest Pokemon ID wanted
+            last_id: Highest Pokemon ID wanted
+            
+        Returns:
+            Dictionary mapping ID to {'id', 'name'} for the species the list returned
+        """
+        species = {}
+        for offset in range(first_id - 1, last_id, self.page_size):
+            limit = min(self.page_size, last_id - offset)
+            for entry in self.client.iter_list(f"{self.base_url}?limit={limit}&offset={offset}"):
+                pokemon_id = int(entry['url'].rstrip('/').rsplit('/', 1)[1])
+                species[pokemon_id] = {'id': pokemon_id, 'name': entry['name']}
+        return species
+
+    def fetch_many(self, pokemon_ids: Iterable[int]) -> Dict[int, Optional[Dict]]:
+        pokemon_ids = list(pokemon_ids)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(pokemon_ids, executor.map(self.fetch_pokemon, pokemon_ids)))
+
+    def fetch_names(self, pokemon_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+        pokemon_ids = list(pokemon_ids)
+
+        # Names from one or a few list calls per run of nearby IDs
+        listed = {}
+        try:
+            for first_id, last_id in _id_spans(pokemon_ids):
+                listed.update(self.list_species(first_id, last_id))
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"Error listing Pokemon, fetching the rest one by one: {e}")
+
+        # Anything the list did not cover falls back to per-species documents
+        missing = [pokemon_id for pokemon_id in pokemon_ids if pokemon_id not in listed]
+        fetched = self.fetch_many(missing) if missing else {}
+        names = {pokemon_id: document['name'] for pokemon_id, document in listed.items()}
+        names.update((pokemon_id, document['name'] if document else None) for pokemon_id, document in fetched.items())
+        return {pokemon_id: names.get(pokemon_id) for pokemon_id in pokemon_ids}
+
+
+def _id_spans(pokemon_ids: Iterable[int], max_gap: int = LIST_MAX_GAP) -> List[Tuple[int, int]]:
+    """Group IDs into inclusive (first, last) spans, splitting wherever more than max_gap unwanted IDs lie between."""
+    spans: List[Tuple[int, int]] = []
+    for pokemon_id in sorted(set(pokemon_ids)):
+        if spans and pokemon_id - spans[-1][1] - 1 <= max_gap:
+            spans[-1] = (spans[-1][0], pokemon_id)
+        else:
+            spans.append((pokemon_id, pokemon_id))
+    return spans
+
+
+class LocalFileSource(TileDataSource):
+    """Backend reading species from disk.
+    
+    path may be a JSON file holding either a list of documents or an object keyed
+    by ID, or a directory of per-species '<id>.json' files.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the backend.
+        
+        Args:
+            path: JSON file or directory of '<id>.json' files
+        """
+        self.path = path
+        self._documents: Optional[Dict[int, Dict]] = None
+
+    def _load_file(self) -> Dict[int, Dict]:
+        """Read and index the single JSON file once; an unreadable file indexes nothing."""
+        if self._documents is None:
+            self._documents = {}
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                # Like a missing per-species file: every ID falls back to a placeholder
+                print(f"Error reading Pokemon from {self.path}: {e}")
+                return self._documents
+            entries = data.items() if isinstance(data, dict) else ((doc.get('id'), doc) for doc in data
+                                                                   if isinstance(doc, dict))
+            for pokemon_id, doc in entries:
+                try:
+                    self._documents[int(pokemon_id)] = doc
+                except (TypeError, ValueError):
+                    print(f"Skipping Pokemon entry without a valid id in {self.path}: {doc}")
+        return self._documents
+
+    def fetch_pokemon(self, pokemon_id: int) -> Optional[Dict]:
+        if not os.path.isdir(self.path):
+            return self._load_file().get(pokemon_id)
+
+        try:
+            with open(os.path.join(self.path, f"{pokemon_id}.json"), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading Pokemon {pokemon_id} from {self.path}: {e}")
+            return None
+
+
+class StubSource(TileDataSource):
+    """In-process backend that needs no network or files."""
+
+    def __init__(self, names: Optional[Dict[int, str]] = None):
+        """
+        Initialize the backend.
+        
+        Args:
+            names: Optional ID -> name overrides; other IDs are named 'pokemon<id>'
+        """
+        self.names = names or {}
+
+    def fetch_pokemon(self, pokemon_id: int) -> Optional[Dict]:
+        return {'id': pokemon_id, 'name': self.names.get(pokemon_id, f"pokemon{pokemon_id}")}
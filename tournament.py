@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Strategy tournament runner for PokeJong.
+Plays round-robin matches between discard strategies across a process pool,
+stops each pairing once the result is statistically clear, and reports win
+rates, mean scores and Elo ratings.
+"""
+
+import contextlib
+import itertools
+import math
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from game import PokeJongGame
+from player import Player
+from pokemon_tile import PokemonTile, PokemonTileFactory
+from tile_source import StubSource
+
+# A strategy picks the index of the tile to discard from player.hand
+Strategy = Callable[[Player, PokeJongGame, random.Random], int]
+
+
+def random_discard(player: Player, game: PokeJongGame, rng: random.Random) -> int:
+    """Discard a uniformly random tile."""
+    return rng.randrange(len(player.hand))
+
+
+def discard_loneliest(player: Player, game: PokeJongGame, rng: random.Random) -> int:
+    """Discard the tile with the fewest copies in hand, cheapest first."""
+    return min(range(len(player.hand)),
+               key=lambda i: (player.hand_counts[player.hand[i].pokemon_id], player.hand[i].points))
+
+
+def discard_cheapest(player: Player, game: PokeJongGame, rng: random.Random) -> int:
+    """Discard the lowest-point tile, breaking ties towards unmatched tiles."""
+    return min(range(len(player.hand)),
+               key=lambda i: (player.hand[i].points, player.hand_counts[player.hand[i].pokemon_id]))
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    'random': random_discard,
+    'loneliest': discard_loneliest,
+    'cheapest': discard_cheapest,
+}
+
+
+def play_game(strategies: List[Strategy], species: List[PokemonTile], seed: int,
+              rules: Optional[Dict[str, float]] = None, max_turns: int = 1000, recorder=None) -> Dict:
+    """
+    Play one headless game between two strategies on a seeded wall.
+    
+    Args:
+        strategies: Strategies for player 1 and player 2
+        species: One template tile per Pokemon in the tile set
+        seed: Seed for the wall shuffle and the strategies' random choices
+        rules: Optional PokeJongGame attribute overrides (e.g. {'ron_multiplier': 2})
+        max_turns: Safety limit on discards
+        recorder: Optional GameRecorder that receives every turn and the finished game
+        
+    Returns:
+        Dictionary with 'winner' (0, 1 or None), 'scores', 'win_type' and 'turns'
+    """
+    game = PokeJongGame("Seat 1", "Seat 2")
+    for name, value in (rules or {}).items():
+        setattr(game, name, value)
+    game.recorder = recorder
+
+    rng = random.Random(seed)
+    game.deal(PokemonTileFactory.build_wall(species, num_copies=4, rng=random.Random(seed)))
+    seats = {game.player1: 0, game.player2: 1}
+
+    # The dealer draws first and may win on the spot
+    if game.draw_tile():
+        game.check_win_condition()
+
+    while not game.game_over and game.turn_count < max_turns:
+        player = game.current_player
+        if not player.hand:
+            # Kong calls draw no replacement tile, so a hand can run dry; score it as a tie
+            break
+        game.take_turn(strategies[seats[player]](player, game, rng))
+
+    if recorder is not None:
+        recorder.record_game(game, seed)
+    return {
+        'winner': seats[game.winner] if game.winner else None,
+        'scores': (game.player1.score, game.player2.score),
+        'win_type': game.win_type,
+        'turns': game.turn_count,
+    }
+
+
+def _play_pair(strategy_a: Strategy, strategy_b: Strategy, species: List[PokemonTile], seed: int,
+               rules: Optional[Dict[str, float]]) -> List[Dict]:
+    """Play both seatings of a pairing on the same wall; results are from A's point of view."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        first = play_game([strategy_a, strategy_b], species, seed, rules)
+        second = play_game([strategy_b, strategy_a], species, seed, rules)
+
+    results = []
+    for result, a_seat in ((first, 0), (second, 1)):
+        if result['winner'] is None:
+            a_score = 0.5
+        else:
+            a_score = 1.0 if result['winner'] == a_seat else 0.0
+        results.append({
+            'a_result': a_score,
+            'a_points': result['scores'][a_seat],
+            'b_points': result['scores'][1 - a_seat],
+            'win_type': result['win_type'],
+            'turns': result['turns'],
+        })
+    return results
+
+
+def confidence_interval(values: List[float], z: float = 2.576):
+    """Normal-approximation confidence interval (99% by default) for the mean of values."""
+    n = len(values)
+    mean = sum(values) / n
+    if n < 2:
+        return mean, 0.0, 1.0
+    variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+    half_width = z * math.sqrt(variance / n)
+    return mean, mean - half_width, mean + half_width
+
+
+class Tournament:
+    """Round-robin tournament between named discard strategies."""
+
+    def __init__(self, strategies: Dict[str, Strategy], num_pokemon: int = 20,
+                 rules: Optional[Dict[str, float]] = None, max_workers: Optional[int] = None,
+                 batch_size: int = 16, min_pairs: int = 16, max_pairs: int = 500,
+                 z: float = 2.576, elo_k: float = 16, base_seed: int = 0):
+        """
+        Initialize the tournament.
+        
+        Args:
+            strategies: Strategy name -> strategy function (must be picklable)
+            num_pokemon: Number of species in the tile set
+            rules: Optional PokeJongGame attribute overrides applied to every game
+            max_workers: Process pool size (default: CPU count)
+            batch_size: Seeded game pairs submitted per round for each pairing
+            min_pairs: Game pairs played before early stopping is considered
+            max_pairs: Upper bound on game pairs per pairing
+            z: z-score of the confidence intervals used for early stopping
+            elo_k: Elo K-factor
+            base_seed: First wall seed; pairs use consecutive seeds from here
+        """
+        self.strategies = strategies
+        self.rules = rules
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.min_pairs = min_pairs
+        self.max_pairs = max_pairs
+        self.z = z
+        self.elo_k = elo_k
+        self.base_seed = base_seed
+        # Offline species list, built once and shipped to every worker
+        self.species = [PokemonTileFactory.create_tile(pokemon_id, StubSource())
+                        for pokemon_id in range(1, num_pokemon + 1)]
+
+    def _separated(self, a_results: List[float]) -> bool:
+        """True once A's and B's score-rate intervals no longer overlap (A's interval excludes 0.5)."""
+        _, low, high = confidence_interval(a_results, self.z)
+        return low > 0.5 or high < 0.5
+
+    def _run_pairing(self, executor: ProcessPoolExecutor, name_a: str, name_b: str) -> List[Dict]:
+        """Play seeded game pairs for one pairing until separated or max_pairs is reached."""
+        games: List[Dict] = []
+        seed = self.base_seed
+        pairs = 0
+        while pairs < self.max_pairs:
+            count = min(self.batch_size, self.max_pairs - pairs)
+            futures = [executor.submit(_play_pair, self.strategies[name_a], self.strategies[name_b],
+                                       self.species, seed + i, self.rules)
+                       for i in range(count)]
+            for future in futures:
+                games.extend(future.result())
+            seed += count
+            pairs += count
+            if pairs >= self.min_pairs and self._separated([g['a_result'] for g in games]):
+                break
+        return games
+
+    def run(self) -> Dict:
+        """
+        Play every pairing and build the report.
+        
+        Returns:
+            Dictionary with per-pairing results under 'pairings' and per-strategy
+            'win_rate', 'mean_score' and 'elo' under 'standings'
+        """
+        ratings = {name: 1500.0 for name in self.strategies}
+        totals = {name: Counter() for name in self.strategies}
+        pairings = []
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for name_a, name_b in itertools.combinations(self.strategies, 2):
+                games = self._run_pairing(executor, name_a, name_b)
+                a_results = [g['a_result'] for g in games]
+                mean, low, high = confidence_interval(a_results, self.z)
+                pairings.append({
+                    'a': name_a, 'b': name_b, 'games': len(games),
+                    'a_score_rate': mean, 'interval': (low, high),
+                    'separated': self._separated(a_results),
+                })
+
+                for game in games:
+                    expected_a = 1 / (1 + 10 ** ((ratings[name_b] - ratings[name_a]) / 400))
+                    delta = self.elo_k * (game['a_result'] - expected_a)
+                    ratings[name_a] += delta
+                    ratings[name_b] -= delta
+                    for name, result, points in ((name_a, game['a_result'], game['a_points']),
+                                                 (name_b, 1 - game['a_result'], game['b_points'])):
+                        totals[name]['games'] += 1
+                        totals[name]['wins'] += result == 1.0
+                        totals[name]['points'] += points
+
+        standings = {
+            name: {
+                'games': totals[name]['games'],
+                'win_rate': totals[name]['wins'] / max(totals[name]['games'], 1),
+                'mean_score': totals[name]['points'] / max(totals[name]['games'], 1),
+                'elo': ratings[name],
+            }
+            for name in self.strategies
+        }
+        return {'pairings': pairings, 'standings': standings}
+
+
+def print_report(report: Dict):
+    """Print a tournament report as two small tables."""
+    print("\n" + "=" * 60)
+    print("PAIRINGS")
+    print("=" * 60)
+    for p in report['pairings']:
+        low, high = p['interval']
+        stop = "separated" if p['separated'] else "inconclusive"
+        print(f"{p['a']:>10} vs {p['b']:<10} {p['games']:5d} games  "
+              f"A score {p['a_score_rate']:.3f} [{low:.3f}, {high:.3f}]  {stop}")
+
+    print("\n" + "=" * 60)
+    print("STANDINGS")
+    print("=" * 60)
+    for name, s in sorted(report['standings'].items(), key=lambda item: -item[1]['elo']):
+        print(f"{name:<12} Elo {s['elo']:7.1f}  Win rate {s['win_rate']:.3f}  "
+              f"Mean score {s['mean_score']:7.1f}  ({s['games']} games)")
+
+
+if __name__ == "__main__":
+    print_report(Tournament(STRATEGIES).run())
@@ -0,0 +1,60 @@
+"""
+Zobrist hashing module for PokeJong.
+Every (zone, species, copy number) triple has a fixed random 64-bit key. A
+zone's hash is the XOR of the keys of the tiles in it, so adding or removing
+one tile is a single XOR and the hash never has to be recomputed. Keys come
+from a fixed-seed mixer, so hashes are stable across runs and processes and
+can be stored in transposition tables or replay indexes.
+"""
+
+from functools import lru_cache
+from typing import Mapping
+
+MASK_64 = (1 << 64) - 1
+
+# Zone kinds; player zones are also keyed by player_id so the two seats differ
+HAND = 0
+MELDS = 1
+DISCARD_PILE = 2
+TURN = 3
+
+ZOBRIST_SEED = 0x9E3779B97F4A7C15
+
+
+def _splitmix64(value: int) -> int:
+    """SplitMix64 finalizer: a well-mixed 64-bit value from an integer."""
+    value = (value + ZOBRIST_SEED) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+@lru_cache(maxsize=None)
+def zobrist_key(kind: int, owner: int, pokemon_id: int, copy: int) -> int:
+    """
+    Key for the copy-th tile (1-4) of a species in a zone.
+
+    Args:
+        kind: HAND, MELDS, DISCARD_PILE or TURN
+        owner: player_id for player zones, 0 for shared ones
+        pokemon_id: The species
+        copy: Which copy this is (the count after adding it)
+
+    Returns:
+        64-bit key
+    """
+    return _splitmix64((((kind * 4 + owner) << 32 | pokemon_id) << 8) | copy)
+
+
+def toggle(zone_hash: int, kind: int, owner: int, pokemon_id: int, copy: int) -> int:
+    """XOR one tile into or out of a zone hash (the operation is its own inverse)."""
+    return zone_hash ^ zobrist_key(kind, owner, pokemon_id, copy)
+
+
+def hash_counts(kind: int, owner: int, counts: Mapping[int, int]) -> int:
+    """Hash a whole zone from scratch; the incremental updates must always agree with this."""
+    zone_hash = 0
+    for pokemon_id, count in counts.items():
+        for copy in range(1, count + 1):
+            zone_hash ^= zobrist_key(kind, owner, pokemon_id, copy)
+    return zone_hash